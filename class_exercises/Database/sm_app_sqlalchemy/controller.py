@@ -1,17 +1,101 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 import sqlalchemy as sa
 import sqlalchemy.orm as so
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from class_exercises.Database.sm_app_sqlalchemy.models import User, Post, Comment, likes_table, recalculate_like_counts
+
+# The sessions bound by Controller.session_scope, keyed by controller. A ContextVar has its own value in each
+# thread and asyncio task. ContextVars are never freed, so there is one for the module rather than one per
+# Controller
+_scoped_sessions: ContextVar[dict['Controller', so.Session]] = ContextVar('scoped_sessions', default={})
+
+def create_engine(db_location: str, pool_size: int = 5, max_overflow: int = 10, pool_timeout: float = 30,
+                  busy_timeout: int = 5000) -> sa.Engine:
+    """ Create an engine whose connection pool is shared by every thread using it. For SQLite files, each new
+    connection is switched to WAL mode (readers don't block the writer or each other) and waits up to
+    busy_timeout ms for the write lock instead of failing straight away with 'database is locked'. Foreign keys
+    are enforced on every SQLite connection """
+    url = sa.make_url(db_location)
+    is_sqlite = url.get_backend_name() == 'sqlite'
+    in_memory = is_sqlite and url.database in (None, '', ':memory:')
+    # An in-memory SQLite database only exists inside its one connection, so it can't have a pool to size
+    pool_options = {} if in_memory else {'pool_size': pool_size,
+                                         'max_overflow': max_overflow,
+                                         'pool_timeout': pool_timeout,
+                                         }
+    engine = sa.create_engine(url, **pool_options)
 
-from class_exercises.Database.sm_app_sqlalchemy.models import User, Post, Comment
+    if is_sqlite:
+        @sa.event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, _connection_record):
+            cursor = dbapi_connection.cursor()
+            if not in_memory:
+                cursor.execute('PRAGMA journal_mode=WAL')
+                # With WAL, NORMAL only syncs at checkpoints and is still safe against corruption
+                cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout)}')
+            # SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked to
+            cursor.execute('PRAGMA foreign_keys=ON')
+            cursor.close()
+    return engine
 
 
 class Controller:
-    def __init__(self, db_location = 'sqlite:///social_media.db'):
+    def __init__(self, db_location = 'sqlite:///social_media.db', session_factory: so.sessionmaker | None = None,
+                 **engine_options):
+        """ engine_options (pool_size, max_overflow, pool_timeout, busy_timeout) are passed to create_engine.
+        A Controller can be shared between threads: each method checks a session out of session_factory
+        (a sessionmaker bound to the engine by default) and closes it again when it is done """
         self.current_user_id: int|None = None
         self.viewing_post_user_id: int|None = None
-        self.engine = sa.create_engine(db_location)
+        if session_factory is None:
+            self.engine = create_engine(db_location, **engine_options)
+            self.Session = so.sessionmaker(bind=self.engine)
+        else:
+            self.engine = session_factory.kw['bind']
+            self.Session = session_factory
+
+    @contextmanager
+    def session(self) -> Iterator[so.Session]:
+        """ The session bound by session_scope in the current thread or task, otherwise a new session which is
+        closed at the end of the with block """
+        current = _scoped_sessions.get().get(self)
+        if current is not None:
+            yield current
+        else:
+            with self.Session() as session:
+                yield session
+
+    @contextmanager
+    def session_scope(self) -> Iterator[so.Session]:
+        """ Share one session between all the Controller calls made inside the with block (in this thread or task
+        only). It is committed at the end of the block, or rolled back if an exception is raised: the
+        Controller methods only flush their changes while a scope is active """
+        with self.Session() as session:
+            # Set a new dict rather than changing the current one, which other contexts may share
+            token = _scoped_sessions.set({**_scoped_sessions.get(), self: session})
+            try:
+                yield session
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+            finally:
+                _scoped_sessions.reset(token)
+
+    def _commit(self, session: so.Session):
+        """ Commit the changes, unless session belongs to a session_scope which will commit them at its end """
+        if _scoped_sessions.get().get(self) is session:
+            session.flush()
+        else:
+            session.commit()
 
     def set_current_user_from_name(self, name:str) -> User|None:
-        with so.Session(bind=self.engine) as session:
+        with self.session() as session:
             statement = sa.select(User).where(User.name == name)
             user = session.scalars(statement).one_or_none()
 
@@ -24,15 +108,15 @@ class Controller:
         return user
 
     def get_user_names(self) -> list[str]:
-        with so.Session(bind=self.engine) as session:
+        with self.session() as session:
             user_names = session.scalars(sa.select(User.name).order_by(User.name)).all()
         return list(user_names)
 
     def create_user(self, name: str, age: int, gender: str, nationality: str) -> User:
-        with so.Session(bind=self.engine) as session:
+        with self.session() as session:
             user = User(name=name, age=age, gender=gender, nationality=nationality)
             session.add(user)
-            session.commit()
+            self._commit(session)
             # Sets current user to the newly-created user
             self.set_current_user_from_name(user.name)
         return user
@@ -41,7 +125,7 @@ class Controller:
         if user_id is None:
             user_id = self.current_user_id
 
-        with so.Session(bind=self.engine) as session:
+        with self.session() as session:
             user = session.get(User, user_id)
             user_info = {'name': user.name,
                          'age': user.age,
@@ -51,60 +135,139 @@ class Controller:
             return user_info
 
     def get_user_posts(self, user_name: str) -> list[dict]:
-        with so.Session(bind=self.engine) as session:
-            user = session.scalars(sa.select(User).where(User.name == user_name)).one_or_none()
-            posts_info = [{'id': post.id,
-                           'title' : post.title,
-                           'description': post.description,
-                           'number_likes': len(post.liked_by_users),
-                           }
-                          for post in user.posts]
-            self.viewing_post_user_id = user.id
+        # Two queries however many posts there are: likes are counted in SQL with an outer join and GROUP BY,
+        # rather than loading each post's liked_by_users collection
+        with self.session() as session:
+            user_id = session.scalars(sa.select(User.id).where(User.name == user_name)).one()
+            statement = (sa.select(Post.id, Post.title, Post.description,
+                                   sa.func.count(likes_table.c.user_id).label('number_likes'))
+                         .outerjoin(likes_table, likes_table.c.post_id == Post.id)
+                         .where(Post.user_id == user_id)
+                         .group_by(Post.id)
+                         .order_by(Post.id))
+            posts_info = [row._asdict() for row in session.execute(statement)]
+            self.viewing_post_user_id = user_id
         return posts_info
 
     def get_comments(self, post_id) -> list[dict]:
-        with so.Session(bind=self.engine) as session:
-            post = session.get(Post, post_id)
-            comments_info = [{'comment': comment.comment,
-                              'author': comment.user.name,}
-                             for comment in post.comments]
+        # The author's name is joined in the same query instead of lazy loading comment.user for each comment
+        with self.session() as session:
+            statement = (sa.select(Comment.comment, User.name.label('author'))
+                         .join(Comment.user)
+                         .where(Comment.post_id == post_id)
+                         .order_by(Comment.id))
+            comments_info = [row._asdict() for row in session.execute(statement)]
         return comments_info
 
     def write_new_post(self, title, description, user_id = None) -> int:
         if user_id is None:
             user_id = self.current_user_id
 
-        with so.Session(bind=self.engine) as session:
+        with self.session() as session:
             # Quick method to SELECT one record via a primary key id
             user = session.get(User, user_id)
             post = Post(title=title, description=description)
             post_id = post.id
             user.posts.append(post)
-            session.commit()
+            self._commit(session)
         return post_id
 
-    def like_post_toggle(self, post_id, user_id = None):
+    def like_post_toggle(self, post_id, user_id = None) -> bool:
+        """ Like the post, or unlike it if the user already likes it. Returns True if the post is now liked.
+        Works on the likes table by its (user_id, post_id) primary key, so no users or posts are loaded and it
+        takes the same time however many likes the post has. All the statements run in one transaction """
         if user_id is None:
             user_id = self.current_user_id
 
-        with so.Session(bind=self.engine) as session:
-            user = session.get(User, user_id)
-            post = session.get(Post, post_id)
-            if user in post.liked_by_users:
-                post.liked_by_users.remove(user)
-            else:
-                post.liked_by_users.append(user)
-            session.commit()
+        like = (likes_table.c.user_id == user_id) & (likes_table.c.post_id == post_id)
+        with self.session() as session:
+            # Update the counter first, in SQL (not in Python). This checks the post and user exist before
+            # anything is written, and locks the post's row so concurrent toggles of the same post take turns
+            updated = session.execute(sa.update(Post)
+                                      .where(Post.id == post_id, sa.exists().where(User.id == user_id))
+                                      .values(like_count=Post.like_count + sa.case((sa.exists().where(like), -1),
+                                                                                   else_=1))
+                                      .execution_options(synchronize_session=False))
+            if not updated.rowcount:
+                raise ValueError(f'there is no post with id {post_id} or no user with id {user_id}')
+
+            liked = not session.execute(sa.delete(likes_table).where(like)).rowcount
+            if liked:
+                session.execute(sqlite_insert(likes_table)
+                                .values(user_id=user_id, post_id=post_id)
+                                .on_conflict_do_nothing())
+            self._commit(session)
+        return liked
+
+    def get_most_liked_posts(self, limit: int = 10, offset: int = 0, use_counter: bool = True) -> list[dict]:
+        """ The most liked posts, sorted and paginated by the database. With use_counter the indexed like_count
+        column is used; otherwise likes are counted with the Post.number_of_likes subquery """
+        number_likes = Post.like_count if use_counter else Post.number_of_likes
+        with self.session() as session:
+            statement = (sa.select(Post.id, Post.title, User.name.label('author'), number_likes.label('number_likes'))
+                         .join(Post.user)
+                         .order_by(number_likes.desc(), Post.id)
+                         .limit(limit)
+                         .offset(offset))
+            posts_info = [row._asdict() for row in session.execute(statement)]
+        return posts_info
+
+    # ---------- Keyset pagination ----------
+    # Each page method returns up to limit rows as lightweight named tuples (not ORM objects). Pass the id of
+    # the last row of a page as after_id to get the next page. Rows are found by seeking on an indexed id
+    # (WHERE id > after_id ... LIMIT) rather than with OFFSET, so every page costs the same however deep it is.
+
+    @staticmethod
+    def _page(session: so.Session, statement: sa.Select, id_column, after_id: int | None, limit: int,
+              newest_first: bool = False) -> list[sa.Row]:
+        if after_id is not None:
+            statement = statement.where(id_column < after_id if newest_first else id_column > after_id)
+        statement = statement.order_by(id_column.desc() if newest_first else id_column).limit(limit)
+        return list(session.execute(statement).all())
+
+    def get_users_page(self, after_id: int | None = None, limit: int = 20) -> list[sa.Row]:
+        """ Rows of (id, name), in id order """
+        with self.session() as session:
+            return self._page(session, sa.select(User.id, User.name), User.id, after_id, limit)
+
+    def get_user_posts_page(self, user_id: int, after_id: int | None = None, limit: int = 20) -> list[sa.Row]:
+        """ Rows of (id, title, description, number_likes) for one user's posts, in id order """
+        statement = (sa.select(Post.id, Post.title, Post.description, Post.like_count.label('number_likes'))
+                     .where(Post.user_id == user_id))
+        with self.session() as session:
+            return self._page(session, statement, Post.id, after_id, limit)
+
+    def get_comments_page(self, post_id: int, after_id: int | None = None, limit: int = 20) -> list[sa.Row]:
+        """ Rows of (id, comment, author) for the comments on a post, in id order """
+        statement = (sa.select(Comment.id, Comment.comment, User.name.label('author'))
+                     .join(Comment.user)
+                     .where(Comment.post_id == post_id))
+        with self.session() as session:
+            return self._page(session, statement, Comment.id, after_id, limit)
+
+    def get_feed_page(self, after_id: int | None = None, limit: int = 20) -> list[sa.Row]:
+        """ Rows of (id, title, author, number_likes) for every user's posts, newest first. after_id is the
+        id of the last post seen, so the next page holds the posts older than it """
+        statement = (sa.select(Post.id, Post.title, User.name.label('author'), Post.like_count.label('number_likes'))
+                     .join(Post.user))
+        with self.session() as session:
+            return self._page(session, statement, Post.id, after_id, limit, newest_first=True)
+
+    def recalculate_like_counts(self):
+        """ Set every Post.like_count from the likes table, e.g. after likes are added without like_post_toggle """
+        with self.session() as session:
+            recalculate_like_counts(session)
+            self._commit(session)
 
     def comment_on_post(self, post_id, comment, user_id = None):
         if user_id is None:
             user_id = self.current_user_id
 
-        with so.Session(bind=self.engine) as session:
+        with self.session() as session:
             post = session.get(Post, post_id)
             new_comment = Comment(user_id=user_id, comment=comment)
             post.comments.append(new_comment)
-            session.commit()
+            self._commit(session)
 
 if __name__ == '__main__':
     controller = Controller()
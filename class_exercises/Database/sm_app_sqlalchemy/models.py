@@ -20,6 +20,8 @@ likes_table = sa.Table(
     sa.Column('post_id', sa.Integer,
               sa.ForeignKey(column='posts.id', ondelete='CASCADE'),
               primary_key=True),
+    # The primary key index starts with user_id, so likes are also indexed by post_id for counting a post's likes
+    sa.Index('ix_likes_post_id', 'post_id'),
 )
 
 class User(Base):
@@ -58,6 +60,10 @@ class Post(Base):
         nullable=False,
         index=True,
     )
+    # Denormalised count of likes, kept up to date by Controller.like_post_toggle in the same transaction as the
+    # like itself. It is indexed, so posts can be sorted and paginated by popularity without counting likes
+    like_count: Mapped[int] = mapped_column(default=0, server_default='0', index=True)
+
     # Many-to-many: which users liked this post
     liked_by_users: Mapped[List["User"]] = relationship(
         secondary=likes_table,
@@ -75,10 +81,15 @@ class Post(Base):
         cascade='all, delete-orphan',
     )
 
-    # For efficiency, it would be better to include this as a column_property with a subquery to count the users
-    @property
-    def number_of_likes(self) -> int:
-        return len(self.liked_by_users)
+    # Likes counted by the database with a correlated subquery, so the liking Users are never loaded.
+    # Deferred, so it is only queried when used (or when included with so.undefer(Post.number_of_likes))
+    number_of_likes: Mapped[int] = so.column_property(
+        sa.select(sa.func.count(likes_table.c.user_id))
+        .where(likes_table.c.post_id == id)
+        .correlate_except(likes_table)
+        .scalar_subquery(),
+        deferred=True,
+    )
 
     def __repr__(self):
         return f"Post(title='{self.title}', description='{self.description}', user={self.user.name})"
@@ -91,7 +102,7 @@ class Comment(Base):
         sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False
     )
     post_id: so.Mapped[int] = so.mapped_column(
-        sa.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False
+        sa.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False, index=True
     )
 
     # Many-to-one relationship defining the author of a comment
@@ -105,3 +116,6 @@ class Comment(Base):
         return f"Comment(user_id={self.user_id}, post_id={self.post_id}, comment='{self.comment}')"
 
 
+def recalculate_like_counts(session: so.Session):
+    """ Set every Post.like_count from the likes table, in one UPDATE. The caller commits """
+    session.execute(sa.update(Post).values(like_count=Post.number_of_likes.expression))
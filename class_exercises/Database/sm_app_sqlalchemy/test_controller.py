@@ -1,11 +1,14 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import sqlalchemy as sa
 import sqlalchemy.orm as so
 from sqlalchemy.exc import IntegrityError
 
-from class_exercises.Database.sm_app_sqlalchemy.models import User, Comment, Post, Base
+from class_exercises.Database.sm_app_sqlalchemy.models import User, Comment, Post, Base, likes_table
 from class_exercises.Database.sm_app_sqlalchemy.write_to_db import write_initial_data
-from class_exercises.Database.sm_app_sqlalchemy.controller import Controller
+from class_exercises.Database.sm_app_sqlalchemy.controller import Controller, create_engine
 
 # test_db_location = 'sqlite:///:memory:'
 test_db_location = 'sqlite:///test_sm.db'
@@ -111,3 +114,258 @@ class TestController:
 
     def test_like_post(self):
         assert False
+
+
+class TestQueryCounts:
+    """ The read paths should run a fixed number of queries, however many posts, likes and comments there are """
+    @pytest.fixture(scope="class")
+    def controller(self, tmp_path_factory):
+        db_location = f"sqlite:///{tmp_path_factory.mktemp('db') / 'query_counts.db'}"
+        engine = sa.create_engine(db_location)
+        Base.metadata.create_all(engine)
+        with so.Session(bind=engine) as session:
+            fans = [User(name=f"Fan {i}") for i in range(10)]
+            author = User(name="Author")
+            for i in range(30):
+                post = Post(title=f"Post {i}", description="...")
+                post.liked_by_users.extend(fans[:i % 10])
+                post.comments.extend(Comment(comment=f"Comment {j}", user=fans[j]) for j in range(5))
+                author.posts.append(post)
+            session.add_all(fans + [author])
+            session.commit()
+        return Controller(db_location=db_location)
+
+    @staticmethod
+    def count_queries(engine, function, *args):
+        statements = []
+        listener = lambda conn, cursor, statement, *rest: statements.append(statement)
+        sa.event.listen(engine, "before_cursor_execute", listener)
+        try:
+            result = function(*args)
+        finally:
+            sa.event.remove(engine, "before_cursor_execute", listener)
+        return result, len(statements)
+
+    def test_get_user_posts_query_count(self, controller):
+        posts, queries = self.count_queries(controller.engine, controller.get_user_posts, "Author")
+        assert len(posts) == 30
+        likes = {post['title']: post['number_likes'] for post in posts}
+        assert [likes[f"Post {i}"] for i in range(11)] == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0]
+        assert queries <= 2
+
+    def test_get_comments_query_count(self, controller):
+        comments, queries = self.count_queries(controller.engine, controller.get_comments, 1)
+        assert len(comments) == 5
+        assert all(comment['author'] == f"Fan {comment['comment'][-1]}" for comment in comments)
+        assert queries == 1
+
+
+class TestLikeCounts:
+    @pytest.fixture
+    def controller(self, tmp_path):
+        db_location = f"sqlite:///{tmp_path / 'likes.db'}"
+        engine = sa.create_engine(db_location)
+        Base.metadata.create_all(engine)
+        write_initial_data(engine)
+        return Controller(db_location=db_location)
+
+    def test_number_of_likes_column_property(self, controller):
+        with so.Session(bind=controller.engine) as session:
+            post = session.get(Post, 1)
+            assert post.number_of_likes == 2
+            assert post.like_count == 2
+
+    def test_like_post_toggle_maintains_counter(self, controller):
+        controller.like_post_toggle(1, user_id=1)
+        assert controller.get_most_liked_posts(limit=1) == [
+            {'id': 1, 'title': 'Exploring the Rocky Mountains', 'author': 'Alice', 'number_likes': 3}]
+        controller.like_post_toggle(1, user_id=1)
+        controller.like_post_toggle(1, user_id=2)
+        with so.Session(bind=controller.engine) as session:
+            post = session.get(Post, 1)
+            assert post.like_count == post.number_of_likes == 1
+
+    def test_like_post_toggle_statements(self, controller):
+        liked, queries = TestQueryCounts.count_queries(controller.engine, controller.like_post_toggle, 1, 1)
+        assert liked is True
+        assert queries == 3  # UPDATE of the counter, a DELETE which removes nothing, then INSERT
+        liked, queries = TestQueryCounts.count_queries(controller.engine, controller.like_post_toggle, 1, 1)
+        assert liked is False
+        assert queries == 2  # UPDATE, then a DELETE which removes the like
+
+    def test_like_missing_post(self, controller):
+        with pytest.raises(ValueError):
+            controller.like_post_toggle(99, user_id=1)
+        with so.Session(bind=controller.engine) as session:
+            assert session.scalar(sa.select(sa.func.count()).select_from(likes_table)
+                                  .where(likes_table.c.post_id == 99)) == 0
+
+    def test_like_as_missing_user(self, controller):
+        with pytest.raises(ValueError):
+            controller.like_post_toggle(1, user_id=12345)
+        with so.Session(bind=controller.engine) as session:
+            assert session.scalar(sa.select(sa.func.count()).select_from(likes_table)
+                                  .where(likes_table.c.user_id == 12345)) == 0
+            post = session.get(Post, 1)
+            assert post.like_count == post.number_of_likes == 2
+
+    def test_foreign_keys_are_enforced(self, controller):
+        with controller.session() as session:
+            assert session.execute(sa.text("PRAGMA foreign_keys")).scalar() == 1
+            with pytest.raises(IntegrityError):
+                session.execute(likes_table.insert().values(user_id=12345, post_id=1))
+
+    def test_concurrent_toggles(self, controller):
+        """ 40 toggles of the same like end where they started, with the counter still matching the table """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: controller.like_post_toggle(1, user_id=1), range(40)))
+        with so.Session(bind=controller.engine) as session:
+            post = session.get(Post, 1)
+            assert post.like_count == post.number_of_likes == 2
+
+    @pytest.mark.parametrize("use_counter", [True, False])
+    def test_get_most_liked_posts_paginates(self, controller, use_counter):
+        controller.like_post_toggle(4, user_id=2)
+        first_page = controller.get_most_liked_posts(limit=2, use_counter=use_counter)
+        second_page = controller.get_most_liked_posts(limit=2, offset=2, use_counter=use_counter)
+        assert [post['id'] for post in first_page + second_page] == [4, 1, 2, 3]
+        assert [post['number_likes'] for post in first_page + second_page] == [3, 2, 2, 2]
+
+    def test_recalculate_like_counts(self, controller):
+        with so.Session(bind=controller.engine) as session:
+            session.execute(sa.update(Post).values(like_count=0))
+            session.commit()
+        controller.recalculate_like_counts()
+        assert [post['number_likes'] for post in controller.get_most_liked_posts()] == [2, 2, 2, 2]
+
+
+class TestPagination:
+    @pytest.fixture(scope="class")
+    def controller(self, tmp_path_factory):
+        db_location = f"sqlite:///{tmp_path_factory.mktemp('db') / 'pages.db'}"
+        engine = sa.create_engine(db_location)
+        Base.metadata.create_all(engine)
+        with so.Session(bind=engine) as session:
+            users = [User(name=f"User {i}") for i in range(5)]
+            users[0].posts.extend(Post(title=f"Post {i}", description="...") for i in range(25))
+            session.add_all(users)
+            session.flush()
+            users[0].posts[0].comments.extend(Comment(comment=f"Comment {i}", user=users[i % 5]) for i in range(7))
+            session.commit()
+        return Controller(db_location=db_location)
+
+    @staticmethod
+    def read_all_pages(get_page, limit, **kwargs):
+        rows, after_id = [], None
+        while page := get_page(after_id=after_id, limit=limit, **kwargs):
+            assert len(page) <= limit
+            rows += page
+            after_id = page[-1].id
+        return rows
+
+    def test_users_pages(self, controller):
+        rows = self.read_all_pages(controller.get_users_page, limit=2)
+        assert [row.name for row in rows] == [f"User {i}" for i in range(5)]
+
+    def test_user_posts_pages(self, controller):
+        rows = self.read_all_pages(controller.get_user_posts_page, limit=10, user_id=1)
+        assert len(rows) == 25
+        assert rows[0]._fields == ('id', 'title', 'description', 'number_likes')
+        assert [row.id for row in rows] == sorted(row.id for row in rows)
+
+    def test_comments_pages(self, controller):
+        post_id = controller.get_user_posts_page(user_id=1, limit=1)[0].id
+        rows = self.read_all_pages(controller.get_comments_page, limit=3, post_id=post_id)
+        assert [(row.comment, row.author) for row in rows][:2] == [("Comment 0", "User 0"), ("Comment 1", "User 1")]
+        assert len(rows) == 7
+
+    def test_feed_is_newest_first(self, controller):
+        rows = self.read_all_pages(controller.get_feed_page, limit=4)
+        ids = [row.id for row in rows]
+        assert ids == sorted(ids, reverse=True)
+        assert len(ids) == 25
+        assert rows[0].author == "User 0"
+
+
+class TestConcurrency:
+    @pytest.fixture
+    def controller(self, tmp_path):
+        db_location = f"sqlite:///{tmp_path / 'concurrent.db'}"
+        engine = sa.create_engine(db_location)
+        Base.metadata.create_all(engine)
+        write_initial_data(engine)
+        with so.Session(bind=engine) as session:
+            session.add_all(User(name=f"Reader {i}") for i in range(40))
+            session.commit()
+        engine.dispose()
+        return Controller(db_location=db_location, pool_size=8, busy_timeout=10_000)
+
+    def test_sqlite_pragmas(self, controller):
+        with controller.engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 10_000
+
+    def test_in_memory_database(self):
+        engine = create_engine('sqlite:///:memory:')
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+    def test_session_scope_shares_one_session(self, controller):
+        with controller.session_scope() as session:
+            with controller.session() as inner:
+                assert inner is session
+        with controller.session() as first, controller.session() as second:
+            assert first is not second
+
+    def test_session_scope_rolls_back(self, controller):
+        with pytest.raises(ValueError):
+            with controller.session_scope() as session:
+                session.add(User(name="Never saved"))
+                raise ValueError
+        assert "Never saved" not in controller.get_user_names()
+
+    def test_session_scope_rolls_back_controller_writes(self, controller):
+        liked_posts = controller.get_most_liked_posts()
+        with pytest.raises(RuntimeError):
+            with controller.session_scope():
+                controller.create_user("Ghost", 30, "male", "British")
+                controller.write_new_post("Boo", "...")
+                controller.like_post_toggle(1, user_id=controller.current_user_id)
+                raise RuntimeError
+        assert "Ghost" not in controller.get_user_names()
+        assert controller.get_feed_page(limit=1)[0].title != "Boo"
+        assert controller.get_most_liked_posts() == liked_posts
+
+    def test_session_scope_commits_controller_writes(self, controller):
+        with controller.session_scope():
+            controller.create_user("Casper", 30, "male", "British")
+            with pytest.raises(ValueError):
+                controller.like_post_toggle(99)
+            controller.write_new_post("Boo", "...")
+        assert "Casper" in controller.get_user_names()
+        assert controller.get_feed_page(limit=1)[0].title == "Boo"
+
+    @pytest.mark.parametrize("num_threads", [1, 4, 8])
+    def test_threaded_throughput(self, controller, num_threads):
+        """ Every reader likes every post once, spread across num_threads threads, while reading the feed """
+        with so.Session(bind=controller.engine) as session:
+            reader_ids = session.scalars(sa.select(User.id).where(User.name.like("Reader %"))).all()
+            post_ids = session.scalars(sa.select(Post.id)).all()
+        before = {post['id']: post['number_likes'] for post in controller.get_most_liked_posts()}
+
+        def work(user_ids):
+            for user_id in user_ids:
+                for post_id in post_ids:
+                    controller.like_post_toggle(post_id, user_id=user_id)
+                    controller.get_feed_page(limit=5)
+            return len(user_ids) * len(post_ids) * 2
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            operations = sum(executor.map(work, [reader_ids[i::num_threads] for i in range(num_threads)]))
+        seconds = time.perf_counter() - start
+        print(f"{num_threads} threads: {operations / seconds:.0f} operations/s")
+
+        with so.Session(bind=controller.engine) as session:
+            for post in session.scalars(sa.select(Post)):
+                assert post.like_count == post.number_of_likes == before[post.id] + len(reader_ids)
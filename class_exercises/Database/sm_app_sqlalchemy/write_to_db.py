@@ -1,6 +1,6 @@
 import sqlalchemy as sa
 import sqlalchemy.orm as so
-from class_exercises.Database.sm_app_sqlalchemy.models import User, Post, Comment, Base
+from class_exercises.Database.sm_app_sqlalchemy.models import User, Post, Comment, Base, recalculate_like_counts
 
 def delete_existing_data(engine):
     # Delete in dependency order: child tables first, then parents
@@ -57,6 +57,10 @@ def write_initial_data(engine):
     session.add_all(users)
     session.commit()
 
+    # The likes above were added through the relationships, so set the denormalised like counts to match
+    recalculate_like_counts(session)
+    session.commit()
+
     # Create examples of Comments
     comments = [
         Comment(user_id=users[1].id, comment="Wow, the Rockies sound incredible! Thanks for sharing your experience."),
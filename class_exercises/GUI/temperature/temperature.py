@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Temperature:
     def __init__(self, *args, **kwargs):
         if args:
@@ -47,6 +50,72 @@ class Temperature:
     def __repr__(self):
         return f"Temperature(celsius={self._celsius:.1f})"
 
+
+class TemperatureArray:
+    """ Array version of Temperature for large sets of readings. The readings are held in one NumPy array in
+    celsius and the fahrenheit and kelvin properties convert the whole array at once, with the same absolute
+    zero checks as Temperature applied to every value."""
+    def __init__(self, *args, **kwargs):
+        if args:
+            self.celsius = args[0]
+        elif 'celsius' in kwargs:
+            self.celsius = kwargs['celsius']
+        elif 'fahrenheit' in kwargs:
+            self.fahrenheit = kwargs['fahrenheit']
+        elif 'kelvin' in kwargs:
+            self.kelvin = kwargs['kelvin']
+        else:
+            raise TypeError('Temperatures in celsius, fahrenheit or kelvin must be specified')
+
+    @staticmethod
+    def _to_array(values) -> np.ndarray:
+        # Copy the values, so changing the caller's array afterwards can't get round the absolute zero checks.
+        # A single reading becomes an array of one
+        return np.atleast_1d(np.array(values, dtype=np.float64))
+
+    @property
+    def celsius(self) -> np.ndarray:
+        return self._celsius
+
+    @celsius.setter
+    def celsius(self, values):
+        values = self._to_array(values)
+        if (values < -273.15).any():
+            raise ValueError('Celsius values must be greater than absolute zero (-273.15 \u00B0C)')
+        self._celsius = values
+
+    @property
+    def fahrenheit(self) -> np.ndarray:
+        return self._celsius * 9 / 5 + 32
+
+    @fahrenheit.setter
+    def fahrenheit(self, values):
+        values = self._to_array(values)
+        if (values < -459.67).any():
+            raise ValueError('Fahrenheit values must be greater than absolute zero (-459.67 \u00B0F)')
+        self._celsius = (values - 32) * 5 / 9
+
+    @property
+    def kelvin(self) -> np.ndarray:
+        return self._celsius + 273.15
+
+    @kelvin.setter
+    def kelvin(self, values):
+        values = self._to_array(values)
+        if (values < 0).any():
+            raise ValueError('Kelvin values must be greater than absolute zero (0 \u00B0K)')
+        self._celsius = values - 273.15
+
+    def __len__(self) -> int:
+        return len(self._celsius)
+
+    def __getitem__(self, index) -> Temperature:
+        """ A single reading as a Temperature object """
+        return Temperature(celsius=float(self._celsius[index]))
+
+    def __repr__(self):
+        return f"TemperatureArray(celsius={np.array2string(self._celsius, precision=1, threshold=6)})"
+
 if __name__ == '__main__':
     temp = Temperature(25)
     # Note PyCharm is warning me not to do this!
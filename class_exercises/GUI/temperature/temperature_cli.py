@@ -0,0 +1,84 @@
+import argparse
+import csv
+import sys
+from itertools import islice
+from typing import TextIO
+
+import numpy as np
+
+from class_exercises.GUI.temperature.temperature import TemperatureArray
+
+UNITS = ('celsius', 'fahrenheit', 'kelvin')
+CHUNK_SIZE = 100_000
+
+
+def convert_stream(source: TextIO, destination: TextIO, from_unit: str, to_unit: str, column: int | str = 0,
+                   header: bool = False, chunk_size: int = CHUNK_SIZE, precision: int = 2) -> int:
+    """ Convert the temperatures in one column of a CSV (or one reading per line) from from_unit to to_unit,
+    chunk_size rows at a time, so memory use stays the same however long the input is. Each chunk is checked
+    and converted with a TemperatureArray, and the converted values replace the originals in the output.
+    column can be an index, or a name if the input has a header row. Blank lines are skipped.
+    Returns the number of rows converted."""
+    if from_unit not in UNITS or to_unit not in UNITS:
+        raise ValueError(f'units must be one of {", ".join(UNITS)}')
+    if isinstance(column, int) and column < 0:
+        raise ValueError('the column index must be 0 or more')
+    reader = csv.reader(source)
+    writer = csv.writer(destination, lineterminator='\n')
+
+    if header:
+        names = next(reader, [])
+        if isinstance(column, str):
+            if column not in names:
+                raise ValueError(f'there is no column named {column}')
+            column = names.index(column)
+        elif column >= len(names):
+            raise ValueError(f'there is no column {column}, the header has {len(names)} columns')
+        names[column] = to_unit
+        writer.writerow(names)
+    elif isinstance(column, str):
+        raise ValueError('a column name can only be used with a header row')
+
+    total = 0
+    while chunk := list(islice(reader, chunk_size)):
+        rows = [row for row in chunk if row]
+        if not rows:
+            continue
+        first, last = total + 1, total + len(rows)
+        if any(len(row) <= column for row in rows):
+            raise ValueError(f'rows {first}-{last}: not every row has a column {column}')
+        try:
+            temperatures = TemperatureArray(**{from_unit: [row[column] for row in rows]})
+        except ValueError as e:
+            raise ValueError(f'rows {first}-{last}: {e}') from e
+        converted = np.char.mod(f'%.{precision}f', getattr(temperatures, to_unit))
+        for row, value in zip(rows, converted):
+            row[column] = value
+        writer.writerows(rows)
+        total += len(rows)
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert temperature readings between units, a chunk at a time')
+    parser.add_argument('input', nargs='?', default='-', help='CSV file to read, or - for stdin (the default)')
+    parser.add_argument('-o', '--output', default='-', help='CSV file to write, or - for stdout (the default)')
+    parser.add_argument('-f', '--from', dest='from_unit', choices=UNITS, default='celsius')
+    parser.add_argument('-t', '--to', dest='to_unit', choices=UNITS, default='fahrenheit')
+    parser.add_argument('-c', '--column', default='0', help='index of the temperature column, or its name')
+    parser.add_argument('--header', action='store_true', help='the first row holds column names')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='rows to convert at a time')
+    parser.add_argument('--precision', type=int, default=2, help='decimal places in the output')
+    args = parser.parse_args()
+
+    in_file = sys.stdin if args.input == '-' else open(args.input, 'r', newline='')
+    out_file = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    try:
+        convert_stream(in_file, out_file, args.from_unit, args.to_unit,
+                       column=int(args.column) if args.column.isdigit() else args.column,
+                       header=args.header, chunk_size=args.chunk_size, precision=args.precision)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        for f in (in_file, out_file):
+            if f not in (sys.stdin, sys.stdout):
+                f.close()
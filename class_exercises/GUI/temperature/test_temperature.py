@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from class_exercises.GUI.temperature.temperature import Temperature, TemperatureArray
+
+
+def test_conversions():
+    temperatures = TemperatureArray(celsius=[-40, 0, 100])
+    assert temperatures.fahrenheit.tolist() == pytest.approx([-40, 32, 212])
+    assert temperatures.kelvin.tolist() == pytest.approx([233.15, 273.15, 373.15])
+    assert TemperatureArray(fahrenheit=[212]).celsius.tolist() == pytest.approx([100])
+    assert TemperatureArray(kelvin=[0]).celsius.tolist() == pytest.approx([-273.15])
+
+
+@pytest.mark.parametrize("unit, value", [("celsius", -274), ("fahrenheit", -460), ("kelvin", -1)])
+def test_setters_reject_values_below_absolute_zero(unit, value):
+    with pytest.raises(ValueError):
+        TemperatureArray(**{unit: [20, value]})
+    temperatures = TemperatureArray([20])
+    with pytest.raises(ValueError):
+        setattr(temperatures, unit, [value])
+    assert temperatures.celsius.tolist() == [20]
+
+
+def test_no_temperature():
+    with pytest.raises(TypeError):
+        TemperatureArray()
+
+
+def test_values_are_copied():
+    readings = np.array([10.0, 20.0])
+    temperatures = TemperatureArray(celsius=readings)
+    readings[0] = -1000
+    assert temperatures.celsius.tolist() == [10, 20]
+
+
+def test_single_reading():
+    temperatures = TemperatureArray(celsius=25)
+    assert len(temperatures) == 1
+    assert temperatures.fahrenheit.tolist() == [77]
+
+
+def test_getitem():
+    temperatures = TemperatureArray(celsius=[0, 37.5])
+    reading = temperatures[-1]
+    assert isinstance(reading, Temperature)
+    assert reading.celsius == 37.5
+    assert reading.fahrenheit == pytest.approx(99.5)
+    with pytest.raises(IndexError):
+        temperatures[2]
@@ -0,0 +1,44 @@
+import io
+
+import pytest
+
+from class_exercises.GUI.temperature.temperature_cli import convert_stream
+
+
+def convert(text, *args, **kwargs):
+    destination = io.StringIO()
+    count = convert_stream(io.StringIO(text), destination, *args, **kwargs)
+    return count, destination.getvalue()
+
+
+def test_one_reading_per_line():
+    assert convert("0\n100\n-40\n", "celsius", "fahrenheit") == (3, "32.00\n212.00\n-40.00\n")
+
+
+def test_small_chunks():
+    count, output = convert("\n".join(str(c) for c in range(10)), "celsius", "kelvin", chunk_size=3, precision=1)
+    assert count == 10
+    assert output.splitlines() == [f"{c + 273.15:.1f}" for c in range(10)]
+
+
+def test_named_column_with_header():
+    text = "station,temp\nleeds,10\nyork,-5\n"
+    assert convert(text, "celsius", "fahrenheit", column="temp", header=True) == (
+        2, "station,fahrenheit\nleeds,50.00\nyork,23.00\n")
+
+
+def test_blank_lines_are_skipped():
+    assert convert("10\n20\n\n", "celsius", "celsius", chunk_size=2) == (2, "10.00\n20.00\n")
+
+
+@pytest.mark.parametrize("text, kwargs, message", [
+    ("a,b\n1,2\n", {"column": 2, "header": True}, "no column 2"),
+    ("a,b\n1,2\n", {"column": "c", "header": True}, "no column named c"),
+    ("1,2\n3\n", {"column": 1}, "rows 1-2: not every row has a column 1"),
+    ("10\nwarm\n", {}, "rows 1-2"),
+    ("10\n-300\n", {}, "absolute zero"),
+    ("10\n", {"column": "temp"}, "header row"),
+])
+def test_bad_input(text, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        convert(text, "celsius", "fahrenheit", **kwargs)
@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+import numpy as np
+
+from fighting_fantasy import Character, Game
+
+BattleStats = namedtuple('BattleStats', ('battles',
+                                         'win_probability',
+                                         'loss_probability',
+                                         'both_dead_probability',
+                                         'mean_rounds',
+                                         'round_counts',
+                                         'mean_stamina_left',
+                                         'mean_stamina_left_when_won',
+                                         ))
+
+# Number of battles simulated together in one set of arrays. Only running totals are kept between chunks,
+# so this limits the memory used
+CHUNK_SIZE = 1_000_000
+
+
+def dice_sums(rng: np.random.Generator, size: int, num_dice: int = 2, num_sides: int = 6) -> np.ndarray:
+    """returns an array of size totals, each the sum of num_dice dice with num_sides sides"""
+    return rng.integers(1, num_sides + 1, size=(size, num_dice)).sum(axis=1)
+
+
+def _simulate_chunk(rng, size, player_skill, player_stamina, opponent_skill, opponent_stamina, max_rounds):
+    """ Fight size battles side by side, following the rules of Character.fight_round, until every battle has a
+    dead character. Returns the final stamina of both sides and the number of rounds each battle lasted """
+    player = np.full(size, player_stamina, dtype=np.int64)
+    opponent = np.full(size, opponent_stamina, dtype=np.int64)
+    rounds = np.zeros(size, dtype=np.int64)
+    fighting = np.flatnonzero((player > 0) & (opponent > 0))
+
+    for _ in range(max_rounds):
+        if fighting.size == 0:
+            break
+        player_score = dice_sums(rng, fighting.size) + player_skill
+        opponent_score = dice_sums(rng, fighting.size) + opponent_skill
+        won = player_score > opponent_score
+        lost = player_score < opponent_score
+        draw = ~(won | lost)
+
+        opponent[fighting] -= 2 * won + draw
+        player[fighting] -= 2 * lost + draw
+        rounds[fighting] += 1
+        fighting = fighting[(player[fighting] > 0) & (opponent[fighting] > 0)]
+    return player, opponent, rounds
+
+
+def simulate_battles(player_skill: int, player_stamina: int, opponent_skill: int, opponent_stamina: int,
+                     num_battles: int = 100_000, seed=None, max_rounds: int = 1_000) -> BattleStats:
+    """ Estimate the outcome of a fight to the death by simulating num_battles battles with NumPy dice.
+    Each chunk of battles is reduced to running totals before the next is simulated, so memory use stays the
+    same however many battles there are """
+    rng = np.random.default_rng(seed)
+    wins = losses = both_dead = 0
+    stamina_left = stamina_left_when_won = 0
+    round_counts = np.zeros(0, dtype=np.int64)
+    for start in range(0, num_battles, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, num_battles - start)
+        player, opponent, rounds = _simulate_chunk(rng, size, player_skill, player_stamina,
+                                                   opponent_skill, opponent_stamina, max_rounds)
+        won = (player > 0) & (opponent <= 0)
+        wins += int(won.sum())
+        losses += int(((player <= 0) & (opponent > 0)).sum())
+        both_dead += int(((player <= 0) & (opponent <= 0)).sum())
+        player_left = np.maximum(player, 0)
+        stamina_left += int(player_left.sum())
+        stamina_left_when_won += int(player_left[won].sum())
+
+        chunk_counts = np.bincount(rounds)
+        if len(chunk_counts) > len(round_counts):
+            round_counts = np.pad(round_counts, (0, len(chunk_counts) - len(round_counts)))
+        round_counts[:len(chunk_counts)] += chunk_counts
+
+    total_rounds = int(np.arange(len(round_counts)) @ round_counts)
+    per_battle = 1 / num_battles if num_battles else 0.0
+    return BattleStats(battles=num_battles,
+                       win_probability=wins * per_battle,
+                       loss_probability=losses * per_battle,
+                       both_dead_probability=both_dead * per_battle,
+                       mean_rounds=total_rounds * per_battle,
+                       round_counts=round_counts,
+                       mean_stamina_left=stamina_left * per_battle,
+                       mean_stamina_left_when_won=stamina_left_when_won / wins if wins else 0.0,
+                       )
+
+
+def simulate_roster(player: Character, creatures: list[Character] | None = None,
+                    num_battles: int = 100_000, seed=None) -> dict[str, BattleStats]:
+    """ Simulate player fighting each creature (the Game roster by default), with an independent random
+    stream for every creature so results don't depend on the order of the roster """
+    if creatures is None:
+        creatures = Game.load_creatures()
+    seeds = np.random.SeedSequence(seed).spawn(len(creatures))
+    return {creature.name: simulate_battles(player.skill, player.stamina, creature.skill, creature.stamina,
+                                            num_battles, seed=creature_seed)
+            for creature, creature_seed in zip(creatures, seeds)}
+
+
+if __name__ == "__main__":
+    hero = Character('Hero', skill=9, stamina=19)
+    for name, stats in simulate_roster(hero, num_battles=1_000_000, seed=1).items():
+        print(f'{name:>10}: win {stats.win_probability:.3f}, lose {stats.loss_probability:.3f}, '
+              f'{stats.mean_rounds:.1f} rounds, {stats.mean_stamina_left:.1f} stamina left')
@@ -0,0 +1,97 @@
+from collections import namedtuple
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+
+from fighting_fantasy import Character, Game
+
+BattleOutcome = namedtuple('BattleOutcome', ('win', 'loss', 'both_dead', 'fled', 'expected_rounds'))
+
+# Number of ways of rolling each total with two six-sided dice
+TWO_DICE_WAYS = {total: sum(1 for a, b in product(range(1, 7), repeat=2) if a + b == total)
+                 for total in range(2, 13)}
+
+
+@lru_cache(maxsize=None)
+def round_probabilities(skill_diff: int) -> tuple[float, float, float]:
+    """ Probabilities (won, lost, draw) of one fight_round for a player whose skill is skill_diff more than
+    the opponent's. Each side scores 2d6 + skill, so only the difference in skill matters."""
+    won = lost = draw = 0
+    for (player_roll, player_ways), (opponent_roll, opponent_ways) in product(TWO_DICE_WAYS.items(), repeat=2):
+        ways = player_ways * opponent_ways
+        margin = player_roll + skill_diff - opponent_roll
+        if margin > 0:
+            won += ways
+        elif margin < 0:
+            lost += ways
+        else:
+            draw += ways
+    total = 36 * 36
+    return won / total, lost / total, draw / total
+
+
+# Outcome tables already solved, keyed by (skill_diff, flee_at). See _outcome_table
+_tables: dict[tuple[int, int], np.ndarray] = {}
+
+
+def _outcome_table(skill_diff: int, flee_at: int, player_stamina: int, opponent_stamina: int) -> np.ndarray:
+    """ The battle is a Markov chain over (player stamina, opponent stamina). Returns an array where
+    table[:, p + 1, o + 1] holds the BattleOutcome fields starting from stamina p and o, for every p up to at
+    least player_stamina and o up to at least opponent_stamina (index 0 is stamina -1, which a draw at 1 can
+    reach). Every round takes 2 stamina in total, so each state depends only on states whose total stamina is
+    2 less. The table is filled bottom-up one diagonal (p + o) at a time, with no recursion however large the
+    staminas. Tables are cached per skill difference and grown when a bigger battle needs them."""
+    table = _tables.get((skill_diff, flee_at))
+    if table is not None:
+        if table.shape[1] >= player_stamina + 2 and table.shape[2] >= opponent_stamina + 2:
+            return table
+        player_stamina = max(player_stamina, table.shape[1] - 2)
+        opponent_stamina = max(opponent_stamina, table.shape[2] - 2)
+
+    stamina_p = np.arange(-1, player_stamina + 1)[:, None]
+    stamina_o = np.arange(-1, opponent_stamina + 1)[None, :]
+    player_dead, opponent_dead = stamina_p <= 0, stamina_o <= 0
+    table = np.zeros((5, player_stamina + 2, opponent_stamina + 2))
+    table[0] = opponent_dead & ~player_dead
+    table[1] = player_dead & ~opponent_dead
+    table[2] = player_dead & opponent_dead
+    table[3] = (stamina_p <= flee_at) & ~player_dead & ~opponent_dead
+
+    won, lost, draw = round_probabilities(skill_diff)
+    fighting_p = np.arange(max(flee_at, 0) + 1, player_stamina + 1)
+    for total in range(2, player_stamina + opponent_stamina + 1):
+        p = fighting_p[(total - fighting_p >= 1) & (total - fighting_p <= opponent_stamina)]
+        if p.size == 0:
+            continue
+        row, col = p + 1, total - p + 1
+        table[:, row, col] = (won * table[:, row, col - 2]
+                              + lost * table[:, row - 2, col]
+                              + draw * table[:, row - 1, col - 1])
+        table[4, row, col] += 1
+    _tables[skill_diff, flee_at] = table
+    return table
+
+
+def solve_battle(player_skill: int, player_stamina: int, opponent_skill: int, opponent_stamina: int,
+                 flee_at: int = 0) -> BattleOutcome:
+    """ Exact probabilities of each way a battle can end, and the expected number of rounds.
+    The player flees (ending the battle) once their stamina is flee_at or lower; 0 means fight to the death."""
+    table = _outcome_table(player_skill - opponent_skill, flee_at, player_stamina, opponent_stamina)
+    return BattleOutcome(*(float(value) for value in table[:, max(player_stamina, -1) + 1,
+                                                              max(opponent_stamina, -1) + 1]))
+
+
+def solve_roster(player: Character, creatures: list[Character] | None = None,
+                 flee_at: int = 0) -> dict[str, BattleOutcome]:
+    if creatures is None:
+        creatures = Game.load_creatures()
+    return {creature.name: solve_battle(player.skill, player.stamina, creature.skill, creature.stamina, flee_at)
+            for creature in creatures}
+
+
+if __name__ == "__main__":
+    hero = Character('Hero', skill=9, stamina=19)
+    for name, outcome in solve_roster(hero).items():
+        print(f'{name:>10}: win {outcome.win:.4f}, lose {outcome.loss:.4f}, '
+              f'{outcome.expected_rounds:.2f} rounds')
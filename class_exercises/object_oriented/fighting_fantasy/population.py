@@ -0,0 +1,183 @@
+import numpy as np
+
+from fighting_fantasy import Character
+from battle_simulator import dice_sums
+
+# fight_round results are stored as small integers rather than strings
+WON, LOST, DRAW = 1, -1, 0
+
+
+class CharacterPopulation:
+    """ Many Fighting Fantasy characters stored as a structure of arrays, one NumPy array per attribute, so that
+    whole populations can fight, take hits and test their luck in single array operations.
+    population[i] gives a CharacterView with the same attributes and methods as a PlayerCharacter."""
+    def __init__(self, skill, stamina, luck=None, names: list[str] | None = None, seed=None):
+        self.skill = np.array(skill, dtype=np.int64)
+        self.stamina = np.array(stamina, dtype=np.int64)
+        self.luck = np.zeros_like(self.skill) if luck is None else np.array(luck, dtype=np.int64)
+        # Which members are PlayerCharacters (with luck) rather than plain Characters
+        self.has_luck = np.full(len(self.skill), luck is not None)
+        self.names = names
+        self.roll = np.zeros_like(self.skill)
+        self.score = np.zeros_like(self.skill)
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def generate(cls, size: int, seed=None) -> 'CharacterPopulation':
+        """ Roll skill, stamina and luck for size characters, as PlayerCharacter.generate_player_character does """
+        rng = np.random.default_rng(seed)
+        population = cls(skill=6 + dice_sums(rng, size, num_dice=1),
+                         stamina=12 + dice_sums(rng, size, num_dice=2),
+                         luck=6 + dice_sums(rng, size, num_dice=1))
+        population.rng = rng
+        return population
+
+    @classmethod
+    def from_characters(cls, characters: list[Character], seed=None) -> 'CharacterPopulation':
+        population = cls(skill=[c.skill for c in characters],
+                         stamina=[c.stamina for c in characters],
+                         luck=[getattr(c, 'luck', 0) for c in characters],
+                         names=[c.name for c in characters],
+                         seed=seed)
+        population.has_luck[:] = [hasattr(c, 'luck') for c in characters]
+        return population
+
+    def __len__(self) -> int:
+        return len(self.skill)
+
+    def __getitem__(self, index: int) -> 'CharacterView':
+        if not -len(self) <= index < len(self):
+            raise IndexError('population index out of range')
+        return CharacterView(self, index % len(self))
+
+    def __repr__(self) -> str:
+        return f"CharacterPopulation(size={len(self)})"
+
+    def _select(self, where) -> np.ndarray:
+        """ Convert where (None for everyone, a boolean mask or an array of indices) to an array of indices """
+        if where is None:
+            return np.arange(len(self))
+        where = np.asarray(where)
+        return np.flatnonzero(where) if where.dtype == bool else where
+
+    def find_score(self, where=None):
+        index = self._select(where)
+        self.roll[index] = dice_sums(self.rng, len(index))
+        self.score[index] = self.roll[index] + self.skill[index]
+
+    def take_hit(self, damage=2, where=None):
+        self.stamina[self._select(where)] -= damage
+
+    def fight_round(self, other: 'CharacterPopulation', where=None) -> np.ndarray:
+        """ Character i of this population fights character i of other. Returns an array of WON, LOST or DRAW
+        for each selected pair, from this population's point of view """
+        index = self._select(where)
+        self.find_score(index)
+        other.find_score(index)
+        result = np.sign(self.score[index] - other.score[index])
+        # Winners deal 2 damage, and a draw costs both sides 1
+        other.stamina[index] -= np.where(result == WON, 2, np.where(result == DRAW, 1, 0))
+        self.stamina[index] -= np.where(result == LOST, 2, np.where(result == DRAW, 1, 0))
+        return result
+
+    @property
+    def is_dead(self) -> np.ndarray:
+        return self.stamina <= 0
+
+    def test_luck(self, where=None) -> np.ndarray:
+        index = self._select(where)
+        self.roll[index] = dice_sums(self.rng, len(index))
+        lucky = self.roll[index] <= self.luck[index]
+        self.luck[index] -= 1
+        return lucky
+
+
+class CharacterView:
+    """ A single member of a CharacterPopulation, reading and writing its attributes through to the arrays """
+    __slots__ = ('population', 'index')
+
+    def __init__(self, population: CharacterPopulation, index: int):
+        self.population = population
+        self.index = index
+
+    def __repr__(self):
+        # Matches the repr of the Character or PlayerCharacter this member stands for
+        if not self.population.has_luck[self.index]:
+            return f"Character('{self.name}', skill={self.skill}, stamina={self.stamina})"
+        return (f"PlayerCharacter('{self.name}', "
+                f"skill={self.skill}, "
+                f"stamina={self.stamina}, "
+                f"luck={self.luck})")
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def name(self) -> str:
+        names = self.population.names
+        return names[self.index] if names is not None else f'Character {self.index}'
+
+    @property
+    def skill(self) -> int:
+        return int(self.population.skill[self.index])
+
+    @property
+    def stamina(self) -> int:
+        return int(self.population.stamina[self.index])
+
+    @stamina.setter
+    def stamina(self, value: int):
+        self.population.stamina[self.index] = value
+
+    @property
+    def luck(self) -> int:
+        return int(self.population.luck[self.index])
+
+    @property
+    def roll(self) -> int:
+        return int(self.population.roll[self.index])
+
+    @property
+    def score(self) -> int:
+        return int(self.population.score[self.index])
+
+    def find_score(self):
+        self.population.find_score([self.index])
+
+    def take_hit(self, damage=2):
+        self.population.take_hit(damage, [self.index])
+
+    def fight_round(self, other: 'CharacterView') -> str:
+        self.find_score()
+        other.find_score()
+        if self.score > other.score:
+            result = 'won'
+            other.take_hit()
+        elif self.score < other.score:
+            result = 'lost'
+            self.take_hit()
+        else:
+            result = 'draw'
+            self.take_hit(1)
+            other.take_hit(1)
+        return result
+
+    def return_character_status(self):
+        return f"{self.name} has skill {self.skill} and stamina {self.stamina}"
+
+    def return_roll_status(self):
+        return f"{self.name} rolled {self.roll} for a total score of {self.score}"
+
+    @property
+    def is_dead(self):
+        return self.stamina <= 0
+
+    @is_dead.setter
+    def is_dead(self, dead: bool):
+        if dead:
+            self.stamina = 0
+        else:
+            self.stamina = max(self.stamina, 1)
+
+    def test_luck(self) -> bool:
+        return bool(self.population.test_luck([self.index])[0])
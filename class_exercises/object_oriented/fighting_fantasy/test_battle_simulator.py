@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from fighting_fantasy import Character
+from battle_simulator import dice_sums, simulate_battles, simulate_roster
+
+
+def test_dice_sums():
+    rolls = dice_sums(np.random.default_rng(1), 10_000)
+    assert rolls.min() == 2
+    assert rolls.max() == 12
+    assert rolls.mean() == pytest.approx(7, abs=0.1)
+
+
+def test_evenly_matched():
+    stats = simulate_battles(8, 10, 8, 10, num_battles=50_000, seed=1)
+    assert stats.win_probability == pytest.approx(stats.loss_probability, abs=0.02)
+    assert stats.win_probability + stats.loss_probability + stats.both_dead_probability == pytest.approx(1)
+    assert stats.round_counts.sum() == 50_000
+
+
+def test_overwhelming_skill_always_wins():
+    # The opponent can never roll higher, so every round is won and the opponent loses 2 stamina a round
+    stats = simulate_battles(20, 10, 0, 6, num_battles=1_000, seed=1)
+    assert stats.win_probability == 1
+    assert stats.mean_rounds == 3
+    assert stats.mean_stamina_left_when_won == 10
+
+
+def test_same_seed_same_result():
+    first = simulate_battles(7, 12, 8, 10, num_battles=1_000, seed=5)
+    second = simulate_battles(7, 12, 8, 10, num_battles=1_000, seed=5)
+    assert first.win_probability == second.win_probability
+    assert np.array_equal(first.round_counts, second.round_counts)
+
+
+def test_simulate_roster():
+    results = simulate_roster(Character('hero', 9, 19), num_battles=1_000, seed=1)
+    assert list(results) == ['Dragon', 'Orc', 'Skeleton', 'Giant Rat']
+    assert results['Dragon'].win_probability < results['Giant Rat'].win_probability
+
+
+def test_totals_are_accumulated_across_chunks(monkeypatch):
+    import battle_simulator
+    whole = simulate_battles(7, 12, 8, 10, num_battles=1_000, seed=5)
+    monkeypatch.setattr(battle_simulator, 'CHUNK_SIZE', 300)
+    chunked = simulate_battles(7, 12, 8, 10, num_battles=1_000, seed=5)
+    assert chunked.battles == 1_000
+    assert chunked.round_counts.sum() == 1_000
+    assert chunked.win_probability + chunked.loss_probability + chunked.both_dead_probability == pytest.approx(1)
+    assert chunked.mean_rounds == pytest.approx(whole.mean_rounds, rel=0.1)
+
+
+def test_no_battles():
+    stats = simulate_battles(8, 10, 8, 10, num_battles=0)
+    assert stats.battles == 0
+    assert stats.win_probability == stats.mean_rounds == 0
+    assert stats.round_counts.sum() == 0
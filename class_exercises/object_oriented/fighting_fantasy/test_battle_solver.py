@@ -0,0 +1,49 @@
+import pytest
+from fighting_fantasy import Character
+from battle_simulator import simulate_battles
+from battle_solver import round_probabilities, solve_battle, solve_roster
+
+
+def test_round_probabilities():
+    won, lost, draw = round_probabilities(0)
+    assert won == pytest.approx(lost)
+    assert draw == pytest.approx(146 / 1296)
+    assert round_probabilities(11) == (1.0, 0.0, 0.0)
+
+
+def test_outcomes_sum_to_one():
+    outcome = solve_battle(7, 15, 8, 12, flee_at=4)
+    assert outcome.win + outcome.loss + outcome.both_dead + outcome.fled == pytest.approx(1)
+    assert outcome.fled > 0
+
+
+def test_certain_win():
+    outcome = solve_battle(20, 10, 0, 6)
+    assert outcome.win == 1
+    assert outcome.expected_rounds == 3
+
+
+def test_large_stamina():
+    # Far deeper than the recursion limit would allow if each state were solved recursively
+    outcome = solve_battle(9, 800, 9, 800)
+    assert outcome.win == pytest.approx(outcome.loss)
+    assert outcome.win + outcome.loss + outcome.both_dead == pytest.approx(1)
+
+
+def test_cached_table_grows():
+    small = solve_battle(8, 5, 7, 5)
+    assert solve_battle(8, 50, 7, 60).win > small.win
+    assert solve_battle(8, 5, 7, 5) == small
+
+
+def test_matches_simulation():
+    exact = solve_battle(8, 14, 9, 10)
+    simulated = simulate_battles(8, 14, 9, 10, num_battles=200_000, seed=3)
+    assert simulated.win_probability == pytest.approx(exact.win, abs=0.01)
+    assert simulated.mean_rounds == pytest.approx(exact.expected_rounds, abs=0.05)
+
+
+def test_solve_roster():
+    results = solve_roster(Character('hero', 9, 19))
+    assert list(results) == ['Dragon', 'Orc', 'Skeleton', 'Giant Rat']
+    assert results['Giant Rat'].win > results['Dragon'].win
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from fighting_fantasy import Character, Game, PlayerCharacter
+from population import CharacterPopulation, WON, LOST, DRAW
+
+
+class TestCharacterPopulation:
+    @pytest.fixture
+    def players(self):
+        return CharacterPopulation.generate(10_000, seed=1)
+
+    def test_generate(self, players):
+        assert len(players) == 10_000
+        assert players.skill.min() >= 7 and players.skill.max() <= 12
+        assert players.stamina.min() >= 14 and players.stamina.max() <= 24
+        assert players.luck.min() >= 7 and players.luck.max() <= 12
+
+    def test_fight_round(self, players):
+        creatures = CharacterPopulation(skill=np.full(10_000, 7), stamina=np.full(10_000, 10))
+        stamina_before = players.stamina.copy()
+        result = players.fight_round(creatures)
+        assert set(np.unique(result)) <= {WON, LOST, DRAW}
+        assert np.array_equal(players.stamina, stamina_before - np.select([result == LOST, result == DRAW], [2, 1]))
+        assert np.array_equal(creatures.stamina, 10 - np.select([result == WON, result == DRAW], [2, 1]))
+
+    def test_fight_round_where(self, players):
+        creatures = CharacterPopulation(skill=np.zeros(10_000), stamina=np.full(10_000, 10))
+        alive = np.zeros(10_000, dtype=bool)
+        alive[:5] = True
+        players.fight_round(creatures, where=alive)
+        assert (creatures.stamina[:5] < 10).all()
+        assert (creatures.stamina[5:] == 10).all()
+
+    def test_take_hit_and_is_dead(self, players):
+        players.take_hit(100, where=[0, 1])
+        assert players.is_dead[:2].all()
+        assert not players.is_dead[2:].any()
+
+    def test_test_luck(self, players):
+        luck_before = players.luck.copy()
+        lucky = players.test_luck()
+        assert np.array_equal(lucky, players.roll <= luck_before)
+        assert np.array_equal(players.luck, luck_before - 1)
+
+
+class TestCharacterView:
+    @pytest.fixture
+    def population(self):
+        return CharacterPopulation.from_characters(Game.load_creatures(), seed=2)
+
+    def test_view_matches_character_api(self, population):
+        dragon = population[0]
+        assert repr(dragon) == "Character('Dragon', skill=10, stamina=22)"
+        assert dragon.return_character_status() == 'Dragon has skill 10 and stamina 22'
+
+    def test_repr_matches_source_class(self):
+        hero = PlayerCharacter('Hero', skill=9, stamina=19, luck=8)
+        population = CharacterPopulation.from_characters([hero, Character('Orc', skill=6, stamina=8)])
+        assert [repr(member) for member in population] == [repr(hero), "Character('Orc', skill=6, stamina=8)"]
+
+    def test_arrays_are_copied(self):
+        skill = np.array([7, 8])
+        population = CharacterPopulation(skill=skill, stamina=[10, 10])
+        skill[0] = 100
+        assert population.skill[0] == 7
+
+    def test_view_writes_through(self, population):
+        orc = population[1]
+        orc.take_hit()
+        assert population.stamina[1] == 8
+        orc.is_dead = True
+        assert population.is_dead[1]
+
+    def test_view_fight_round(self, population):
+        dragon, rat = population[0], population[-1]
+        result = dragon.fight_round(rat)
+        assert result in ('won', 'lost', 'draw')
+        assert dragon.score == dragon.roll + 10
+        assert dragon.stamina + rat.stamina < 22 + 6
+
+    def test_index_error(self, population):
+        with pytest.raises(IndexError):
+            population[4]
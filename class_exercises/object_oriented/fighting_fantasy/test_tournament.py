@@ -0,0 +1,38 @@
+import pytest
+from fighting_fantasy import Character
+import tournament
+from tournament import run_tournament
+
+
+@pytest.fixture(autouse=True)
+def small_shards(monkeypatch):
+    monkeypatch.setattr(tournament, 'SHARD_SIZE', 500)
+
+
+def test_round_robin():
+    results = run_tournament(2_000, seed=1)
+    assert list(results) == ['Dragon', 'Orc', 'Skeleton', 'Giant Rat']
+    for stats in results.values():
+        assert stats.battles == 2_000
+        assert stats.wins + stats.losses + stats.both_dead == 2_000
+    assert results['Dragon'].win_rate < results['Skeleton'].win_rate
+
+
+def test_gauntlet_knocks_out_losers():
+    results = run_tournament(2_000, mode='gauntlet', seed=1)
+    dragon, orc = results['Dragon'], results['Orc']
+    assert dragon.battles == 2_000
+    assert orc.battles == dragon.wins
+
+
+def test_results_do_not_depend_on_workers():
+    creatures = [Character('orc', 7, 10)]
+    assert (run_tournament(1_200, creatures, seed=7, workers=1)
+            == run_tournament(1_200, creatures, seed=7, workers=2))
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        run_tournament(10, mode='league')
+    with pytest.raises(ValueError):
+        run_tournament(10, mode='bracket')
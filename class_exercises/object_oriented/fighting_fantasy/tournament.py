@@ -0,0 +1,100 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fighting_fantasy import Character, Game
+from population import CharacterPopulation
+
+TournamentStats = namedtuple('TournamentStats', ('battles', 'wins', 'losses', 'both_dead',
+                                                 'win_rate', 'mean_rounds', 'mean_stamina_left'))
+
+# Players are split into shards of this size. Each shard has its own random stream, so results depend on the
+# seed and the number of players but not on how many processes are used
+SHARD_SIZE = 100_000
+COUNTS = ('battles', 'wins', 'losses', 'both_dead', 'rounds', 'stamina_left')
+
+
+def _fight_to_death(players: CharacterPopulation, skill: int, stamina: int, entrants: np.ndarray) -> dict:
+    """ Every entrant fights a fresh copy of the creature until one of them dies. Returns summed counts only """
+    creatures = CharacterPopulation(skill=np.full(len(players), skill), stamina=np.full(len(players), stamina))
+    creatures.rng = players.rng
+    rounds = 0
+    fighting = entrants & ~players.is_dead
+    while fighting.any():
+        players.fight_round(creatures, where=fighting)
+        rounds += int(fighting.sum())
+        fighting &= ~players.is_dead & ~creatures.is_dead
+
+    won = entrants & ~players.is_dead & creatures.is_dead
+    lost = entrants & players.is_dead & ~creatures.is_dead
+    return {'battles': int(entrants.sum()),
+            'wins': int(won.sum()),
+            'losses': int(lost.sum()),
+            'both_dead': int((entrants & players.is_dead & creatures.is_dead).sum()),
+            'rounds': rounds,
+            'stamina_left': int(players.stamina[won].sum()),
+            }
+
+
+def _run_shard(size: int, seed: np.random.SeedSequence, creatures: list[tuple[str, int, int]], mode: str) -> dict:
+    """ Generate one shard of players and fight them against the creatures. Only the summed counts are
+    returned, so nothing per-battle has to be sent back between processes """
+    players = CharacterPopulation.generate(size, seed=seed)
+    starting_stamina = players.stamina.copy()
+    everyone = np.ones(size, dtype=bool)
+    totals = {}
+    for name, skill, stamina in creatures:
+        if mode == 'round_robin':
+            # Every player fights every creature, starting each battle at full stamina
+            players.stamina[:] = starting_stamina
+            totals[name] = _fight_to_death(players, skill, stamina, everyone)
+        else:
+            # Gauntlet: survivors carry their injuries into the next creature, and the dead are knocked out
+            totals[name] = _fight_to_death(players, skill, stamina, ~players.is_dead)
+    return totals
+
+
+def run_tournament(num_players: int, creatures: list[Character] | None = None, mode: str = 'round_robin',
+                   workers: int = 1, seed=None) -> dict[str, TournamentStats]:
+    """ Pit num_players randomly generated players against the creature roster (Game.load_creatures by default).
+    mode is 'round_robin' (every player fights every creature) or 'gauntlet' (players fight the creatures in turn
+    until they die). The work is sharded across a pool of workers processes, each shard using its own
+    independent random stream so a seed always gives the same results."""
+    if mode not in ('round_robin', 'gauntlet'):
+        raise ValueError(f'mode {mode} is not valid')
+    if creatures is None:
+        creatures = Game.load_creatures()
+    roster = [(c.name, c.skill, c.stamina) for c in creatures]
+
+    sizes = [min(SHARD_SIZE, num_players - start) for start in range(0, num_players, SHARD_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (sizes, seeds, [roster] * len(sizes), [mode] * len(sizes))
+    if workers == 1:
+        shard_totals = list(map(_run_shard, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_totals = list(executor.map(_run_shard, *args))
+
+    results = {}
+    for name, _, _ in roster:
+        totals = {count: sum(shard[name][count] for shard in shard_totals) for count in COUNTS}
+        battles = totals['battles']
+        results[name] = TournamentStats(battles=battles,
+                                        wins=totals['wins'],
+                                        losses=totals['losses'],
+                                        both_dead=totals['both_dead'],
+                                        win_rate=totals['wins'] / battles if battles else 0.0,
+                                        mean_rounds=totals['rounds'] / battles if battles else 0.0,
+                                        mean_stamina_left=totals['stamina_left'] / totals['wins']
+                                        if totals['wins'] else 0.0,
+                                        )
+    return results
+
+
+if __name__ == "__main__":
+    for tournament_mode in ('round_robin', 'gauntlet'):
+        print(tournament_mode)
+        for creature_name, stats in run_tournament(1_000_000, mode=tournament_mode, workers=4, seed=1).items():
+            print(f'{creature_name:>10}: {stats.battles:>9,} battles, win rate {stats.win_rate:.3f}, '
+                  f'{stats.mean_rounds:.1f} rounds')
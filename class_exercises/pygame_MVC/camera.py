@@ -0,0 +1,39 @@
+# pygame_MVC/camera
+from .game_objects import Position
+
+
+class Camera:
+    """ The block of tiles that is visible on screen. follow() keeps a position (usually the player) in the
+    middle of the view, without scrolling past the edges of the map."""
+    def __init__(self, map_dimensions: tuple[int, int], view_dimensions: tuple[int, int]):
+        self.map_rows, self.map_cols = map_dimensions
+        self.rows = min(view_dimensions[0], self.map_rows)
+        self.cols = min(view_dimensions[1], self.map_cols)
+        self.top = 0
+        self.left = 0
+
+    def __repr__(self) -> str:
+        return f'Camera(top={self.top}, left={self.left}, rows={self.rows}, cols={self.cols})'
+
+    @property
+    def row_range(self) -> range:
+        return range(self.top, self.top + self.rows)
+
+    @property
+    def col_range(self) -> range:
+        return range(self.left, self.left + self.cols)
+
+    def follow(self, pos: Position) -> bool:
+        """ Centre the view on pos. Returns True if the camera moved """
+        top = min(max(pos.row - self.rows // 2, 0), self.map_rows - self.rows)
+        left = min(max(pos.col - self.cols // 2, 0), self.map_cols - self.cols)
+        moved = (top, left) != (self.top, self.left)
+        self.top, self.left = top, left
+        return moved
+
+    def contains(self, pos: Position) -> bool:
+        return pos.row in self.row_range and pos.col in self.col_range
+
+    def to_view(self, pos: Position) -> Position:
+        """ Convert a map position to a position relative to the top-left of the view """
+        return Position(pos.row - self.top, pos.col - self.left)
@@ -4,7 +4,10 @@ import csv
 from collections import namedtuple
 from typing import Optional
 
+import numpy as np
+
 from .game_objects import GameObj, Character, Position
+from .tile_map import TileMap
 
 # Resolve assets path relative to this file
 ASSETS_DIR = Path(__file__).resolve().parent / "assets"
@@ -24,23 +27,83 @@ class Game:
         self.dimensions: tuple[int, int] = (0, 0)
         self._start: Optional[Position] = None
         self._exit: Optional[Position] = None
+        # Spatial index: maps each occupied Position to the objects in that cell. Kept up to date by
+        # observing the .pos setter of every registered object, so cell lookups don't scan every object.
+        self._cells: dict[Position, list[GameObj]] = {}
+        # Optional compact store for the backgrounds, used instead of self.backgrounds for large maps
+        self.tile_map: Optional[TileMap] = None
+        # Incremented whenever a solid background is added or moved, so cached path data can be invalidated
+        self._solid_version = 0
+        self._solid_mask_cache: tuple[int, np.ndarray] | None = None
 
-    def set_up(self, name:str='Player'):
-        self.set_background_from_file(str(FILE_LOCATION))
-        self.characters.append(Character(name, self.start))
+    def set_up(self, name:str='Player', dense:bool=False):
+        if dense:
+            self.set_tile_map_from_file(str(FILE_LOCATION))
+        else:
+            self.set_background_from_file(str(FILE_LOCATION))
+        self.add_character(Character(name, self.start))
 
     def add_background_object(self, b_type:str, pos:Position):
         if b_type in BACKGROUND_TYPES:
             background = BACKGROUND_TYPES[b_type]
-            self.backgrounds.append(GameObj(background.type, pos=pos, solid=background.solid))
+            obj = GameObj(background.type, pos=pos, solid=background.solid)
+            self.backgrounds.append(obj)
+            self._register_object(obj)
+            if obj.is_solid:
+                self._solid_version += 1
+
+    def add_character(self, character: Character):
+        self.characters.append(character)
+        self._register_object(character)
+
+    def _register_object(self, obj: GameObj):
+        """ Add obj to the spatial index and watch it so the index follows any change to obj.pos """
+        self._index_add(obj, obj.pos)
+        obj.add_observer(self._on_object_moved)
+
+    def _index_add(self, obj: GameObj, pos: Optional[Position]):
+        if pos is not None:
+            self._cells.setdefault(pos, []).append(obj)
+
+    def _index_remove(self, obj: GameObj, pos: Optional[Position]):
+        cell = self._cells.get(pos)
+        if cell is not None:
+            cell.remove(obj)
+            if not cell:
+                del self._cells[pos]
+
+    def _on_object_moved(self, obj: GameObj, old_pos: Optional[Position], new_pos: Optional[Position]):
+        self._index_remove(obj, old_pos)
+        self._index_add(obj, new_pos)
+        if obj.is_solid and not isinstance(obj, Character):
+            self._solid_version += 1
+
+    @property
+    def solid_version(self) -> int:
+        """ A number which changes whenever the solid backgrounds change (characters are not included) """
+        tile_map_version = self.tile_map.version if self.tile_map is not None else 0
+        return self._solid_version + tile_map_version
+
+    def solid_mask(self) -> np.ndarray:
+        """ Boolean array of the grid, True where a background is solid. Characters are not included """
+        if self.tile_map is not None:
+            mask = self.tile_map.solid.copy()
+        else:
+            mask = np.zeros(self.dimensions, dtype=bool)
+        for bg in self.backgrounds:
+            if bg.is_solid and bg.pos is not None and self.in_grid(bg.pos):
+                mask[bg.pos.row, bg.pos.col] = True
+        return mask
 
     def set_background_from_file(self, file_location:str):
         with open(file_location, 'r') as f:
-            reader = csv.reader(open(file_location))
+            reader = csv.reader(f)
             for row, line in enumerate(reader):
                 for col, b_type in enumerate(line):
                     self.add_background_object(b_type, pos=Position(row, col))
         self.dimensions = (row + 1, col + 1)
+        # The grid may have changed size even if no solid backgrounds were added
+        self._solid_version += 1
 
         # Cache start/exit if present
         start = self.find_objects_by_name('Start')
@@ -48,14 +111,57 @@ class Game:
         self._start = start[0].pos if start else None
         self._exit = ex[0].pos if ex else None
 
+    def set_tile_map_from_file(self, file_location:str):
+        """ Load the floor plan into a NumPy-backed TileMap rather than creating a GameObj for every tile """
+        self._set_tile_map(TileMap.from_file(file_location, BACKGROUND_TYPES))
+
+    def set_tile_map_from_binary(self, file_location:str):
+        """ Memory-map a binary floor plan (see tile_map.convert_floor_plan) so large maps open instantly """
+        self._set_tile_map(TileMap.from_binary(file_location, BACKGROUND_TYPES))
+
+    def _set_tile_map(self, tile_map: TileMap):
+        # A new TileMap starts again at version 0, so carry the old map's version over (plus one for the change
+        # of map) to keep solid_version increasing
+        if self.tile_map is not None:
+            self._solid_version += self.tile_map.version
+        self._solid_version += 1
+        self.tile_map = tile_map
+        self.dimensions = tile_map.dimensions
+        self._start = tile_map.first_position('Start')
+        self._exit = tile_map.first_position('Exit')
+
     def get_cell_contents(self, pos:Position) -> list[GameObj]:
-        contents = [obj for obj in (self.backgrounds + self.characters) if obj.pos == pos]
+        contents = list(self._cells.get(pos, ()))
+        if self.tile_map is not None and self.in_grid(pos):
+            background = self.tile_map.get(pos)
+            if background is not None:
+                contents.insert(0, background)
         return contents
 
+    def get_region_backgrounds(self, rows: range, cols: range) -> list[GameObj]:
+        """ The backgrounds inside the given block of rows and columns, found through the tile map or the
+        spatial index so the cost depends on the size of the region rather than the whole map """
+        region = []
+        if self.tile_map is not None:
+            codes = self.tile_map.types[rows.start:rows.stop, cols.start:cols.stop]
+            for row, col in zip(*np.nonzero(codes)):
+                region.append(self.tile_map.get(Position(rows.start + int(row), cols.start + int(col))))
+        for row in rows:
+            for col in cols:
+                region.extend(obj for obj in self._cells.get(Position(row, col), ())
+                              if not isinstance(obj, Character))
+        return region
+
+    def in_grid(self, pos:Position) -> bool:
+        return 0 <= pos.row < self.dimensions[0] and 0 <= pos.col < self.dimensions[1]
+
     def check_collision(self, pos:Position) -> bool:
-        outside_grid = not (0 <= pos.row < self.dimensions[0] and 0 <= pos.col < self.dimensions[1])
-        cell_contents = self.get_cell_contents(pos)
-        return outside_grid or any(cell.is_solid for cell in cell_contents)
+        if not self.in_grid(pos):
+            return True
+        if self.tile_map is not None and self.tile_map.is_solid(pos):
+            return True
+        # Read the index directly rather than via get_cell_contents, to avoid copying the cell's list
+        return any(cell.is_solid for cell in self._cells.get(pos, ()))
 
     def move_character(self, character:Character, direction:str) -> bool:
         mv = False
@@ -65,8 +171,76 @@ class Game:
             mv = True
         return mv
 
+    def move_characters(self, characters: list[Character], directions) -> np.ndarray:
+        """ Move many characters at once, returning a boolean array which is True for each character that moved.
+        All moves are resolved together against the solid mask rather than one check_collision per character:
+        a move fails if it leaves the grid or hits a solid background, if an earlier character in the list is
+        heading for the same cell, if the target is held by a solid character that is not moving away, or if two
+        characters would swap places."""
+        n = len(characters)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        try:
+            steps = np.array([Character._directions[d.lower()] for d in directions], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f'direction {e.args[0]} is not valid')
+        if len(steps) != n:
+            raise ValueError('characters and directions must be the same length')
+
+        rows, cols = self.dimensions
+        current = np.array([c.pos for c in characters], dtype=np.int64)
+        target = current + steps
+        in_grid = ((target[:, 0] >= 0) & (target[:, 0] < rows) &
+                   (target[:, 1] >= 0) & (target[:, 1] < cols))
+        moving = in_grid.copy()
+        moving[in_grid] = ~self._cached_solid_mask()[target[in_grid, 0], target[in_grid, 1]]
+
+        # Flatten positions to single integers so they can be compared with np.isin / np.unique
+        current_flat = current[:, 0] * cols + current[:, 1]
+        target_flat = target[:, 0] * cols + target[:, 1]
+
+        # Only the first character heading for each cell may move into it
+        candidates = np.flatnonzero(moving)
+        _, first = np.unique(target_flat[candidates], return_index=True)
+        moving[:] = False
+        moving[candidates[first]] = True
+
+        # Two characters may not pass through each other
+        order = np.argsort(current_flat)
+        match = np.clip(np.searchsorted(current_flat[order], target_flat), 0, n - 1)
+        other = order[match]
+        swap = moving & (current_flat[other] == target_flat) & moving[other] & (target_flat[other] == current_flat)
+        moving &= ~swap
+
+        # Solid characters which are not in the batch never move
+        batch = set(map(id, characters))
+        fixed_flat = np.array([c.pos.row * cols + c.pos.col for c in self.characters
+                               if c.is_solid and id(c) not in batch], dtype=np.int64)
+        solid = np.array([c.is_solid for c in characters], dtype=bool)
+
+        # A blocked character stays put, which may block a character behind it, so repeat until nothing changes
+        while True:
+            occupied = np.concatenate([fixed_flat, current_flat[solid & ~moving]])
+            blocked = moving & np.isin(target_flat, occupied)
+            if not blocked.any():
+                break
+            moving &= ~blocked
+
+        for i in np.flatnonzero(moving):
+            characters[i].pos = Position(int(target[i, 0]), int(target[i, 1]))
+        return moving
+
+    def _cached_solid_mask(self) -> np.ndarray:
+        version = self.solid_version
+        if self._solid_mask_cache is None or self._solid_mask_cache[0] != version:
+            self._solid_mask_cache = (version, self.solid_mask())
+        return self._solid_mask_cache[1]
+
     def find_objects_by_name(self, name:str) -> list[GameObj]:
-        return [obj for obj in self.backgrounds + self.characters if obj.name == name]
+        objects = [obj for obj in self.backgrounds + self.characters if obj.name == name]
+        if self.tile_map is not None:
+            objects += [self.tile_map.get(pos) for pos in self.tile_map.find_positions(name)]
+        return objects
 
     def at_exit(self, char: Character) -> bool:
         return char.pos == self.exit
@@ -83,10 +257,10 @@ class Game:
         game_str = ""
         for row in range(self.dimensions[0]):
             for col in range(self.dimensions[1]):
-                pos = Position(row, col)
-                obj = [obj for obj in self.characters + self.backgrounds if obj.pos == pos]
+                # Characters are always added to a cell after its background, so show the last object
+                obj = self.get_cell_contents(Position(row, col))
                 if obj:
-                    game_str += obj[0].name[0]
+                    game_str += obj[-1].name[0]
                 else:
                     game_str += '.'
             game_str += '\n'
@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+from collections import namedtuple
+from typing import Iterable, Optional
+
+from class_exercises.pygame_MVC.game_controller import Game
+from class_exercises.pygame_MVC.game_objects import Character
+
+SimulationResult = namedtuple('SimulationResult',
+                              ('ticks', 'seconds', 'ticks_per_second', 'reached_exit', 'moves'))
+
+
+class HeadlessInterface:
+    """ Runs the Game model without a display, one fixed tick at a time and as fast as possible.
+    Each tick every character is given a direction, either from a script (e.g. the moves recorded by an
+    earlier run) or chosen at random from a seeded generator, so a run can always be replayed exactly."""
+    def __init__(self, seed: Optional[int] = None, num_characters: int = 1, dense: bool = False,
+                 script: Optional[Iterable[str]] = None):
+        self.game = Game()
+        self.game.set_up(dense=dense)
+        for i in range(1, num_characters):
+            self.game.add_character(Character(f'NPC {i}', self.game.start))
+        self.player = self.game.characters[0]
+        self.rng = random.Random(seed)
+        self.script = iter(script) if script is not None else None
+        # One string per tick, holding a direction letter for each character
+        self.moves: list[str] = []
+        self.directions: Optional[str] = None
+        self.running = True
+
+    def _handle_input(self):
+        """ Sets self.directions for this tick, stopping the run when a script has no moves left """
+        if self.script is not None:
+            self.directions = next(self.script, None)
+            if self.directions is None:
+                self.running = False
+        else:
+            self.directions = ''.join(self.rng.choice('nesw') for _ in self.game.characters)
+
+    def _process_game_logic(self):
+        if self.directions is not None:
+            self.game.move_characters(self.game.characters, self.directions)
+            self.moves.append(self.directions)
+
+    def main_loop(self, max_ticks: int = 10_000, stop_at_exit: bool = True) -> SimulationResult:
+        ticks = 0
+        reached_exit = False
+        start_time = time.perf_counter()
+        while self.running and ticks < max_ticks:
+            self._handle_input()
+            if not self.running:
+                break
+            self._process_game_logic()
+            ticks += 1
+            if self.game.at_exit(self.player):
+                reached_exit = True
+                self.running = not stop_at_exit
+        seconds = time.perf_counter() - start_time
+        ticks_per_second = ticks / seconds if seconds > 0 else float('inf')
+        return SimulationResult(ticks, seconds, ticks_per_second, reached_exit, self.moves)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the maze game without a display')
+    parser.add_argument('--ticks', type=int, default=10_000, help='maximum number of ticks to run')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the random moves')
+    parser.add_argument('--characters', type=int, default=1, help='number of characters to move each tick')
+    parser.add_argument('--dense', action='store_true', help='load the floor plan into a TileMap')
+    parser.add_argument('--keep-going', action='store_true', help="don't stop when the player reaches the exit")
+    args = parser.parse_args()
+
+    headless = HeadlessInterface(seed=args.seed, num_characters=args.characters, dense=args.dense)
+    result = headless.main_loop(max_ticks=args.ticks, stop_at_exit=not args.keep_going)
+    print(f'{result.ticks} ticks in {result.seconds:.3f}s ({result.ticks_per_second:,.0f} ticks/s), '
+          f'reached exit: {result.reached_exit}')
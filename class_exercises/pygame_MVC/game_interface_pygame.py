@@ -1,6 +1,7 @@
 import pygame
-from class_exercises.pygame_mvc.game_controller import Game
-from class_exercises.pygame_mvc.game_objects import Position
+from class_exercises.pygame_MVC.camera import Camera
+from class_exercises.pygame_MVC.game_controller import Game
+from class_exercises.pygame_MVC.game_objects import Position, Character
 
 from pygame.locals import (
     K_LEFT,
@@ -13,6 +14,8 @@ from pygame.locals import (
 )
 
 SQUARE_SIZE = 50
+# Largest number of (rows, cols) shown on screen; bigger maps scroll to follow the player
+VIEW_TILES = (16, 24)
 
 BACKGROUND_COLORS = {'Wall': 'gray30',
                      'Start': 'gold',
@@ -40,16 +43,23 @@ class GameGUI:
         self.player = self.game.characters[0]
         self.move_direction: str | None = None
 
-        self.screen = pygame.display.set_mode([self.game.dimensions[1] * SQUARE_SIZE,
-                                               self.game.dimensions[0] * SQUARE_SIZE])
+        self.camera = Camera(self.game.dimensions, VIEW_TILES)
+        self.camera.follow(self.player.pos)
+        self.screen = pygame.display.set_mode([self.camera.cols * SQUARE_SIZE,
+                                               self.camera.rows * SQUARE_SIZE])
         self.running = True
 
         self.player_image = pygame.image.load('assets/player.png').convert_alpha()
         self.player_rect = self.player_image.get_rect()
 
-    @staticmethod
-    def _convert_position(pos: Position, center: bool = False) -> tuple[int, int]:
-        gx, gy = (SQUARE_SIZE * pos.col, SQUARE_SIZE * pos.row)
+        # Walls never change, so the visible background is drawn once to its own Surface. Each frame only the
+        # areas under characters that have moved are restored from it and redrawn
+        self.drawn_rects: dict[Character, pygame.Rect] = {}
+        self._redraw_view()
+
+    def _convert_position(self, pos: Position, center: bool = False) -> tuple[int, int]:
+        view_pos = self.camera.to_view(pos)
+        gx, gy = (SQUARE_SIZE * view_pos.col, SQUARE_SIZE * view_pos.row)
         if center:
             gx += SQUARE_SIZE // 2
             gy += SQUARE_SIZE // 2
@@ -84,24 +94,64 @@ class GameGUI:
             self.running = False
 
     def _draw(self):
-        self._draw_background()
-        self._draw_characters()
+        if self.camera.follow(self.player.pos):
+            self._redraw_view()
+            return
+        dirty_rects = self._find_dirty_rects()
+        if dirty_rects:
+            for rect in dirty_rects:
+                self.screen.blit(self.background, rect, rect)
+            self._draw_characters(dirty_rects)
+            pygame.display.update(dirty_rects)
+
+    def _redraw_view(self):
+        """ Render the background for the current camera position and draw everything on it """
+        self.background = self._render_background()
+        self.screen.blit(self.background, (0, 0))
+        self.drawn_rects.clear()
+        self._draw_characters([self.screen.get_rect()])
         pygame.display.flip()
 
-    def _draw_background(self):
-        self.screen.fill(BACKGROUND_COLORS['Floor'])
-        for bg in self.game.backgrounds:
+    def _render_background(self) -> pygame.Surface:
+        background = pygame.Surface(self.screen.get_size())
+        background.fill(BACKGROUND_COLORS['Floor'])
+        for bg in self.game.get_region_backgrounds(self.camera.row_range, self.camera.col_range):
             grid_x, grid_y = self._convert_position(bg.pos)
             color = BACKGROUND_COLORS[bg.name]
-            pygame.draw.rect(self.screen, color, (grid_x, grid_y, SQUARE_SIZE, SQUARE_SIZE))
+            pygame.draw.rect(background, color, (grid_x, grid_y, SQUARE_SIZE, SQUARE_SIZE))
+        return background
 
-    def _draw_characters(self):
-        for character in self.game.characters:
-            coord_pos = self._convert_position(character.pos, True)
-            # pygame.draw.circle(self.screen, PLAYER_COLOR, coord_pos, 20)
+    def _character_rect(self, character: Character) -> pygame.Rect:
+        rect = self.player_rect.copy()
+        rect.center = self._convert_position(character.pos, True)
+        return rect
 
-            self.player_rect.center = coord_pos
-            self.screen.blit(self.player_image, self.player_rect)
+    def _find_dirty_rects(self) -> list[pygame.Rect]:
+        """ Rects covering where each moved character was last drawn and where it is now """
+        dirty_rects = []
+        for character in self.game.characters:
+            if not self.camera.contains(character.pos):
+                # Off-screen characters only need their last drawn area cleaned up
+                if character in self.drawn_rects:
+                    dirty_rects.append(self.drawn_rects.pop(character))
+                continue
+            rect = self._character_rect(character)
+            old_rect = self.drawn_rects.get(character)
+            if rect != old_rect:
+                dirty_rects.append(rect)
+                if old_rect is not None:
+                    dirty_rects.append(old_rect)
+        return dirty_rects
+
+    def _draw_characters(self, dirty_rects: list[pygame.Rect]):
+        # Any character overlapping a restored area is redrawn, even if it has not moved itself
+        for character in self.game.characters:
+            if not self.camera.contains(character.pos):
+                continue
+            rect = self._character_rect(character)
+            if rect.collidelist(dirty_rects) != -1:
+                self.screen.blit(self.player_image, rect)
+                self.drawn_rects[character] = rect
 
 
 
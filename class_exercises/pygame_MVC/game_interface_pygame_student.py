@@ -1,6 +1,6 @@
 import pygame
-from class_exercises.pygame_mvc.game_controller import Game
-from class_exercises.pygame_mvc.game_objects import Position
+from class_exercises.pygame_MVC.game_controller import Game
+from class_exercises.pygame_MVC.game_objects import Position
 
 from pygame.locals import (
     K_LEFT,
@@ -1,4 +1,11 @@
-from class_exercises.pygame_mvc.game_controller import Game
+import argparse
+import sys
+from typing import Optional, TextIO
+
+from class_exercises.pygame_MVC.game_controller import Game
+from class_exercises.pygame_MVC.game_objects import GameObj, Position
+
+WALL_CHAR = '\u2593'
 
 
 class TextInterface:
@@ -49,6 +56,74 @@ class TextInterface:
             self._draw_area()
             self._handle_input()
 
+
+class IncrementalTextInterface(TextInterface):
+    """ A text interface which draws the maze once and then only rewrites the cells whose contents have changed,
+    using ANSI escape codes to move the cursor. The grid is kept in self.game_area between turns, and
+    characters are observed so that the cells they leave and enter are marked as needing redrawing."""
+    def __init__(self, out: TextIO = sys.stdout):
+        super().__init__()
+        self.out = out
+        self.dirty: set[Position] = set()
+        self.drawn = False
+        for character in self.game.characters:
+            character.add_observer(self._on_move)
+
+    def _on_move(self, obj: GameObj, old_pos: Optional[Position], new_pos: Optional[Position]):
+        self.dirty.update(pos for pos in (old_pos, new_pos) if pos is not None)
+
+    def _cell_char(self, pos: Position) -> str:
+        """ The character shown for a cell - the first letter of the top object, '.' if empty """
+        contents = self.game.get_cell_contents(pos)
+        char = contents[-1].name[0] if contents else '.'
+        return WALL_CHAR if char == 'W' else char
+
+    @staticmethod
+    def _move_cursor(row: int, col: int) -> str:
+        # ANSI rows and columns start at 1, and the grid sits inside a one character border
+        return f'\x1b[{row + 2};{col + 2}H'
+
+    def _create_area(self):
+        rows, cols = self.game.dimensions
+        self.game_area = [[self._cell_char(Position(row, col)) for col in range(cols)] for row in range(rows)]
+
+    def _draw_area(self):
+        if not self.drawn:
+            self._draw_full()
+        else:
+            self._draw_changes()
+        # Park the cursor on the line below the maze, ready for the input prompt
+        self.out.write(self._move_cursor(self.game.dimensions[0] + 1, -1) + '\x1b[K')
+        self.out.flush()
+
+    def _draw_full(self):
+        self._create_area()
+        width = self.game.dimensions[1]
+        lines = ["\u2554" + "\u2550" * width + "\u2557"]
+        lines += ["\u2551" + "".join(row) + "\u2551" for row in self.game_area]
+        lines.append("\u255A" + "\u2550" * width + "\u255D")
+        # Clear the screen and draw from the top-left corner
+        self.out.write('\x1b[2J\x1b[H' + '\n'.join(lines))
+        self.dirty.clear()
+        self.drawn = True
+
+    def _draw_changes(self):
+        updates = []
+        for pos in self.dirty:
+            if self.game.in_grid(pos):
+                char = self._cell_char(pos)
+                if self.game_area[pos.row][pos.col] != char:
+                    self.game_area[pos.row][pos.col] = char
+                    updates.append(self._move_cursor(pos.row, pos.col) + char)
+        self.out.write(''.join(updates))
+        self.dirty.clear()
+
+
 if __name__ == "__main__":
-    tui = TextInterface()
-    tui.main_loop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Play the maze game in a terminal')
+    parser.add_argument('--plain', action='store_true',
+                        help='redraw the whole board each turn, for consoles without ANSI escape codes')
+    args = parser.parse_args()
+
+    tui = TextInterface() if args.plain else IncrementalTextInterface()
+    tui.main_loop()
@@ -1,6 +1,6 @@
 # pygame_MVC/game_objects
 from collections import namedtuple
-from typing import Optional
+from typing import Callable, Optional
 
 Position = namedtuple('Position', ('row', 'col'), defaults=[0, 0])
 
@@ -9,6 +9,7 @@ class GameObj:
         self._name = name
         self._pos = pos
         self._solid = solid
+        self._observers: list[Callable[['GameObj', Optional[Position], Optional[Position]], None]] = []
 
     def __repr__(self) -> str:
         return f'GameObj(name={self.name}, {self.pos})'
@@ -31,7 +32,17 @@ class GameObj:
     # Code is run when the .pos property of GameObj is changed
     @pos.setter
     def pos(self, value: Position):
+        old_pos = self._pos
         self._pos = value
+        for observer in self._observers:
+            observer(self, old_pos, value)
+
+    def add_observer(self, observer: Callable[['GameObj', Optional[Position], Optional[Position]], None]):
+        """ Register a callback that is run as observer(obj, old_pos, new_pos) whenever .pos changes """
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: Callable[['GameObj', Optional[Position], Optional[Position]], None]):
+        self._observers.remove(observer)
 
     @property
     def is_solid(self) -> bool:
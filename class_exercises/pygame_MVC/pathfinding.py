@@ -0,0 +1,209 @@
+# pygame_MVC/pathfinding
+from collections import deque
+import heapq
+from typing import Optional
+
+import numpy as np
+
+from .game_objects import Character, Position
+
+# Direction letters used by Character.find_next_location and the matching (row, col) steps
+MOVES = {direction: (vec.row, vec.col) for direction, vec in Character._directions.items()}
+UNREACHABLE = -1
+
+
+class Pathfinder:
+    """ Route finding over the solid backgrounds of a Game. Characters are ignored, so the cached data only
+    needs rebuilding when game.solid_version changes.
+
+    bfs, a_star and jps return the list of positions from start to goal (inclusive) or None if there is
+    no route. distance_field gives the number of moves from every cell to a target, and next_move uses it
+    to give a character its next step in constant time."""
+    def __init__(self, game):
+        self.game = game
+        self._version: Optional[int] = None
+        self._open: list[list[bool]] = []
+        self._fields: dict[Position, np.ndarray] = {}
+
+    def _refresh(self):
+        """ Rebuild the walkable grid and drop cached distance fields if the solid backgrounds have changed """
+        version = self.game.solid_version
+        if version != self._version:
+            # Nested lists are much faster than a NumPy array for the single-cell reads made while searching
+            self._open = (~self.game.solid_mask()).tolist()
+            self._fields.clear()
+            self._version = version
+
+    def _is_open(self, row: int, col: int) -> bool:
+        return 0 <= row < len(self._open) and 0 <= col < len(self._open[0]) and self._open[row][col]
+
+    def _neighbours(self, row: int, col: int):
+        for d_row, d_col in MOVES.values():
+            if self._is_open(row + d_row, col + d_col):
+                yield row + d_row, col + d_col
+
+    # ---------- Breadth-first search ----------
+
+    def bfs(self, start: Position, goal: Position) -> Optional[list[Position]]:
+        self._refresh()
+        if not (self._is_open(*start) and self._is_open(*goal)):
+            return None
+        came_from = {tuple(start): None}
+        queue = deque([tuple(start)])
+        while queue:
+            node = queue.popleft()
+            if node == tuple(goal):
+                return self._reconstruct(came_from, node)
+            for neighbour in self._neighbours(*node):
+                if neighbour not in came_from:
+                    came_from[neighbour] = node
+                    queue.append(neighbour)
+        return None
+
+    # ---------- A* ----------
+
+    def a_star(self, start: Position, goal: Position) -> Optional[list[Position]]:
+        self._refresh()
+        if not (self._is_open(*start) and self._is_open(*goal)):
+            return None
+        goal = tuple(goal)
+        came_from = {tuple(start): None}
+        cost = {tuple(start): 0}
+        # Heap entries are (estimated total, cost so far, node); manhattan distance is the heuristic
+        heap = [(_manhattan(start, goal), 0, tuple(start))]
+        while heap:
+            _, node_cost, node = heapq.heappop(heap)
+            if node == goal:
+                return self._reconstruct(came_from, node)
+            if node_cost > cost[node]:
+                continue
+            for neighbour in self._neighbours(*node):
+                new_cost = node_cost + 1
+                if new_cost < cost.get(neighbour, new_cost + 1):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = node
+                    heapq.heappush(heap, (new_cost + _manhattan(neighbour, goal), new_cost, neighbour))
+        return None
+
+    # ---------- Jump point search ----------
+
+    def jps(self, start: Position, goal: Position) -> Optional[list[Position]]:
+        """ A* over jump points for a 4-connected grid. Vertical jumps scan sideways at every step, horizontal
+        jumps only stop at the goal or where a wall ends beside them (a forced neighbour), so long corridors
+        are crossed without pushing every cell onto the heap."""
+        self._refresh()
+        if not (self._is_open(*start) and self._is_open(*goal)):
+            return None
+        start, goal = tuple(start), tuple(goal)
+        came_from = {start: None}
+        cost = {start: 0}
+        heap = [(_manhattan(start, goal), 0, start)]
+        while heap:
+            _, node_cost, node = heapq.heappop(heap)
+            if node == goal:
+                return self._expand(self._reconstruct(came_from, node))
+            if node_cost > cost[node]:
+                continue
+            for d_row, d_col in self._jps_directions(node, came_from[node]):
+                jump_point = self._jump(node, d_row, d_col, goal)
+                if jump_point is None:
+                    continue
+                new_cost = node_cost + _manhattan(node, jump_point)
+                if new_cost < cost.get(jump_point, new_cost + 1):
+                    cost[jump_point] = new_cost
+                    came_from[jump_point] = node
+                    heapq.heappush(heap, (new_cost + _manhattan(jump_point, goal), new_cost, jump_point))
+        return None
+
+    @staticmethod
+    def _jps_directions(node, parent):
+        if parent is None:
+            return list(MOVES.values())
+        d_row = (node[0] > parent[0]) - (node[0] < parent[0])
+        d_col = (node[1] > parent[1]) - (node[1] < parent[1])
+        # Carry on in the same direction, or turn either way
+        if d_row:
+            return [(d_row, 0), (0, 1), (0, -1)]
+        return [(0, d_col), (1, 0), (-1, 0)]
+
+    def _jump(self, node, d_row, d_col, goal):
+        row, col = node
+        while True:
+            row, col = row + d_row, col + d_col
+            if not self._is_open(row, col):
+                return None
+            if (row, col) == goal:
+                return row, col
+            if d_col:
+                # A forced neighbour: a cell above or below that was walled off one step back
+                for side in (1, -1):
+                    if self._is_open(row + side, col) and not self._is_open(row + side, col - d_col):
+                        return row, col
+            elif (self._jump((row, col), 0, 1, goal) is not None
+                  or self._jump((row, col), 0, -1, goal) is not None):
+                return row, col
+
+    @staticmethod
+    def _expand(jump_points: list[Position]) -> list[Position]:
+        """ Fill in the straight-line cells between consecutive jump points """
+        path = [jump_points[0]]
+        for point in jump_points[1:]:
+            d_row = (point.row > path[-1].row) - (point.row < path[-1].row)
+            d_col = (point.col > path[-1].col) - (point.col < path[-1].col)
+            while path[-1] != point:
+                path.append(Position(path[-1].row + d_row, path[-1].col + d_col))
+        return path
+
+    @staticmethod
+    def _reconstruct(came_from: dict, node) -> list[Position]:
+        path = []
+        while node is not None:
+            path.append(Position(*node))
+            node = came_from[node]
+        return path[::-1]
+
+    # ---------- Distance fields ----------
+
+    def distance_field(self, target: Optional[Position] = None) -> np.ndarray:
+        """ Number of moves from each cell to target (the game exit by default), UNREACHABLE for walls and
+        cells with no route. Fields are cached until the solid backgrounds change."""
+        self._refresh()
+        target = Position(*(target or self.game.exit))
+        if target not in self._fields:
+            self._fields[target] = self._build_field(target)
+        return self._fields[target]
+
+    def _build_field(self, target: Position) -> np.ndarray:
+        rows, cols = self.game.dimensions
+        field = np.full((rows, cols), UNREACHABLE, dtype=np.int32)
+        if not self._is_open(*target):
+            return field
+        distances = field.tolist()
+        distances[target.row][target.col] = 0
+        queue = deque([tuple(target)])
+        while queue:
+            row, col = queue.popleft()
+            next_distance = distances[row][col] + 1
+            for n_row, n_col in self._neighbours(row, col):
+                if distances[n_row][n_col] == UNREACHABLE:
+                    distances[n_row][n_col] = next_distance
+                    queue.append((n_row, n_col))
+        field[:] = distances
+        return field
+
+    def next_move(self, character: Character, target: Optional[Position] = None) -> Optional[str]:
+        """ The direction ('n', 'e', 's' or 'w') which takes character one step closer to target,
+        or None if the character is already there or cannot reach it """
+        field = self.distance_field(target)
+        row, col = character.pos
+        current = field[row, col]
+        if current <= 0:
+            return None
+        for direction, (d_row, d_col) in MOVES.items():
+            if self._is_open(row + d_row, col + d_col) and field[row + d_row, col + d_col] == current - 1:
+                return direction
+        return None
+
+
+def _manhattan(a, b) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -0,0 +1,171 @@
+# pygame_MVC/tile_map
+import csv
+import struct
+from functools import cached_property
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .game_objects import GameObj, Position
+
+# Code 0 is used for a cell with no background (an open floor tile)
+EMPTY = 0
+
+# Binary map format: a fixed header, the floor plan tokens (comma separated, utf-8), then one uint8 code per
+# cell in row-major order. The header holds magic, version, token length, rows, cols and the positions of
+# the first Start and Exit tiles (-1 if missing) so a map can be opened without scanning its tiles.
+MAGIC = b'TMAP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIiiii')
+CHUNK_ROWS = 1024
+
+
+class TileMap:
+    """ A compact floor plan which stores one uint8 type code per cell and a boolean mask of the solid cells.
+    GameObj versions of the tiles are only created (and then cached) when they are asked for, so a large map
+    costs a couple of bytes per cell rather than a Python object per cell."""
+    def __init__(self, codes: np.ndarray, background_types: dict):
+        # background_types maps a floor plan token (e.g. 'W') to a Background(type, solid) namedtuple.
+        # The nth background type is given the code n + 1
+        self.tokens: list[str] = list(background_types)
+        self._names: list[Optional[str]] = [None] + [bg.type for bg in background_types.values()]
+        self._solid_codes = np.array([False] + [bg.solid for bg in background_types.values()])
+        self.types: np.ndarray = np.asarray(codes, dtype=np.uint8)
+        self._objects: dict[Position, GameObj] = {}
+        self._first: dict[str, Optional[Position]] = {}
+        # Incremented whenever the solidity of a tile changes
+        self.version = 0
+
+    @classmethod
+    def from_file(cls, file_location: str, background_types: dict) -> 'TileMap':
+        lookup = {token: code for code, token in enumerate(background_types, start=1)}
+        rows = []
+        with open(file_location, 'r') as f:
+            for line in csv.reader(f):
+                if rows and len(line) != len(rows[0]):
+                    raise ValueError(f'Row {len(rows)} of {file_location} has {len(line)} cells, '
+                                     f'expected {len(rows[0])}')
+                rows.append(np.array([lookup.get(token, EMPTY) for token in line], dtype=np.uint8))
+        return cls(np.vstack(rows), background_types)
+
+    @classmethod
+    def from_binary(cls, file_location: str, background_types: dict) -> 'TileMap':
+        """ Memory-map a binary map file, so only the parts of the map which are read are loaded from disk """
+        with open(file_location, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f'{file_location} is not a binary map file')
+            magic, version, token_len, rows, cols, *markers = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'{file_location} is not a version {VERSION} binary map file')
+            tokens = f.read(token_len).decode('utf-8').split(',')
+        if tokens != list(background_types):
+            raise ValueError(f'Map tokens {tokens} do not match the background types {list(background_types)}')
+
+        # Copy-on-write: set_tile can change the map in memory, but the file itself is never written
+        codes = np.memmap(file_location, dtype=np.uint8, mode='c',
+                          offset=HEADER.size + token_len, shape=(rows, cols))
+        tile_map = cls(codes, background_types)
+        for name, row, col in (('Start', *markers[:2]), ('Exit', *markers[2:])):
+            tile_map._first[name] = Position(row, col) if row >= 0 else None
+        return tile_map
+
+    @cached_property
+    def solid(self) -> np.ndarray:
+        """ Boolean mask of the solid cells, built the first time it is needed """
+        return self._solid_codes[self.types]
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        return self.types.shape
+
+    def code_for(self, name: str) -> int:
+        return self._names.index(name)
+
+    def is_solid(self, pos: Position) -> bool:
+        # Look up a single code rather than self.solid, which would read the whole of a memory-mapped map
+        return bool(self._solid_codes[self.types[pos.row, pos.col]])
+
+    def set_tile(self, pos: Position, token: Optional[str]):
+        """ Change the tile at pos to the background type of token ('W', 'S', ...) or to empty if token is None """
+        code = EMPTY if token is None else self.tokens.index(token) + 1
+        old_code = self.types[pos.row, pos.col]
+        self.types[pos.row, pos.col] = code
+        self._objects.pop(pos, None)
+        self._first.clear()
+        if self._solid_codes[code] != self._solid_codes[old_code]:
+            if 'solid' in self.__dict__:
+                self.solid[pos.row, pos.col] = self._solid_codes[code]
+            self.version += 1
+
+    def get(self, pos: Position) -> Optional[GameObj]:
+        """ Return the background GameObj at pos, or None if the cell is empty """
+        code = self.types[pos.row, pos.col]
+        if code == EMPTY:
+            return None
+        obj = self._objects.get(pos)
+        if obj is None:
+            obj = GameObj(self._names[code], pos=pos, solid=bool(self._solid_codes[code]))
+            self._objects[pos] = obj
+        return obj
+
+    def find_positions(self, name: str) -> list[Position]:
+        if name not in self._names[1:]:
+            return []
+        rows, cols = np.nonzero(self.types == self.code_for(name))
+        return [Position(int(row), int(col)) for row, col in zip(rows, cols)]
+
+    def first_position(self, name: str) -> Optional[Position]:
+        if name not in self._first:
+            positions = self.find_positions(name)
+            self._first[name] = positions[0] if positions else None
+        return self._first[name]
+
+    def objects(self) -> Iterator[GameObj]:
+        """ Yield a GameObj for every non-empty cell, in row-major order """
+        rows, cols = np.nonzero(self.types)
+        for row, col in zip(rows, cols):
+            yield self.get(Position(int(row), int(col)))
+
+
+def convert_floor_plan(csv_location: str, binary_location: str, background_types: dict):
+    """ Convert a csv floor plan to the binary map format. Rows are written in chunks of CHUNK_ROWS,
+    so the whole map never has to be held in memory."""
+    lookup = {token: code for code, token in enumerate(background_types, start=1)}
+    token_bytes = ','.join(background_types).encode('utf-8')
+    names = [bg.type for bg in background_types.values()]
+    first = {name: (-1, -1) for name in ('Start', 'Exit')}
+    marker_codes = {names.index(name) + 1: name for name in first if name in names}
+    rows, cols = 0, None
+
+    with open(csv_location, 'r') as f_in, open(binary_location, 'wb') as f_out:
+        # Write a placeholder header, which is filled in once the size of the map is known
+        f_out.write(HEADER.pack(MAGIC, VERSION, len(token_bytes), 0, 0, -1, -1, -1, -1))
+        f_out.write(token_bytes)
+        chunk = []
+        for line in csv.reader(f_in):
+            row_codes = [lookup.get(token, EMPTY) for token in line]
+            if cols is None:
+                cols = len(row_codes)
+            elif len(row_codes) != cols:
+                raise ValueError(f'Row {rows} of {csv_location} has {len(row_codes)} cells, expected {cols}')
+            for code, name in marker_codes.items():
+                if first[name][0] < 0 and code in row_codes:
+                    first[name] = (rows, row_codes.index(code))
+            chunk.append(row_codes)
+            rows += 1
+            if len(chunk) == CHUNK_ROWS:
+                f_out.write(np.array(chunk, dtype=np.uint8).tobytes())
+                chunk = []
+        if chunk:
+            f_out.write(np.array(chunk, dtype=np.uint8).tobytes())
+
+        f_out.seek(0)
+        f_out.write(HEADER.pack(MAGIC, VERSION, len(token_bytes), rows, cols or 0,
+                                *first['Start'], *first['Exit']))
+
+
+if __name__ == "__main__":
+    # Run with python -m so that the relative imports resolve
+    from .game_controller import BACKGROUND_TYPES, FILE_LOCATION
+    convert_floor_plan(str(FILE_LOCATION), str(FILE_LOCATION.with_suffix('.tmap')), BACKGROUND_TYPES)
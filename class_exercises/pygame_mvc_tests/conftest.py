@@ -0,0 +1,24 @@
+import pytest
+
+# A 3x3 map using tokens from BACKGROUND_TYPES (W=Wall(solid), S=Start, E=Exit). Unknown tokens such as '.'
+# are ignored by the controller, leaving an empty floor tile
+SIMPLE_MAP = ["W,.,.",
+              "S,.,E",
+              "W,W,."]
+
+
+@pytest.fixture
+def floor_plan(tmp_path) -> str:
+    """ The path of a CSV file holding SIMPLE_MAP """
+    fp = tmp_path / "floor_plan.csv"
+    fp.write_text("\n".join(SIMPLE_MAP), encoding="utf-8")
+    return str(fp)
+
+
+@pytest.fixture
+def patch_floor_plan(floor_plan, monkeypatch) -> str:
+    """ Point FILE_LOCATION in game_controller at the SIMPLE_MAP floor plan, so Game.set_up (and the
+    interfaces which call it) load that map """
+    import class_exercises.pygame_MVC.game_controller as gc
+    monkeypatch.setattr(gc, "FILE_LOCATION", floor_plan, raising=True)
+    return floor_plan
@@ -0,0 +1,34 @@
+import pytest
+
+from class_exercises.pygame_MVC.camera import Camera
+from class_exercises.pygame_MVC.game_objects import Position
+
+
+class TestCamera:
+
+    @pytest.fixture
+    def camera(self):
+        return Camera(map_dimensions=(100, 200), view_dimensions=(10, 20))
+
+    def test_small_map_is_not_cropped(self):
+        camera = Camera((5, 8), (10, 20))
+        assert (camera.rows, camera.cols) == (5, 8)
+        assert camera.follow(Position(4, 7)) is False
+
+    def test_follow_centres_position(self, camera):
+        assert camera.follow(Position(50, 100)) is True
+        assert (camera.top, camera.left) == (45, 90)
+        assert camera.to_view(Position(50, 100)) == Position(5, 10)
+        assert camera.follow(Position(50, 100)) is False
+
+    def test_follow_clamps_to_map_edges(self, camera):
+        camera.follow(Position(1, 1))
+        assert (camera.top, camera.left) == (0, 0)
+        camera.follow(Position(99, 199))
+        assert (camera.top, camera.left) == (90, 180)
+
+    def test_contains(self, camera):
+        camera.follow(Position(50, 100))
+        assert camera.contains(Position(45, 90))
+        assert not camera.contains(Position(55, 100))
+        assert list(camera.row_range) == list(range(45, 55))
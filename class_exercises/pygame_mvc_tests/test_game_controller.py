@@ -2,8 +2,8 @@ import pytest
 from pathlib import Path
 
 # Adjust import if your package/module path differs
-from class_exercises.pygame_mvc.game_objects import GameObj, Position, Character
-from class_exercises.pygame_mvc.game_controller import Game
+from class_exercises.pygame_MVC.game_objects import GameObj, Position, Character
+from class_exercises.pygame_MVC.game_controller import Game
 
 
 # ---------- Helpers ----------
@@ -18,41 +18,14 @@ def write_floor_plan(tmp_path: Path, lines: list[str]) -> str:
     return str(fp)
 
 
-def make_simple_map(tmp_path: Path) -> str:
-    """
-    A 3x3 map with:
-      W . .
-      S . E
-      W W .
-    Using tokens from BACKGROUND_TYPES: W=Wall(solid), S=Start, E=Exit
-    """
-    # CSV rows: use commas to separate tokens
-    lines = [
-        "W,.,.",
-        "S,.,E",
-        "W,W,."
-    ]
-    # Replace dots with empty tokens or some safe placeholder.
-    # If your controller ignores unknown tokens, keep '.' and assert behavior accordingly.
-    # If your add_background_object raises on unknown tokens, replace '.' with known non-solid, e.g., 'S'/'E' carefully.
-    # For this suite, we’ll keep '.' and let the controller ignore unknown tokens.
-    return write_floor_plan(tmp_path, lines)
-
-
 # ---------- Fixtures ----------
 
 @pytest.fixture
-def game(tmp_path, monkeypatch):
+def game(patch_floor_plan):
     """
-    Provide a fresh Game with a temporary floor plan file.
-    We monkeypatch the FILE_LOCATION constant inside game_controller to point to the temp file.
+    Provide a fresh Game with a temporary floor plan file (the 3x3 SIMPLE_MAP in conftest.py).
+    patch_floor_plan points the FILE_LOCATION constant inside game_controller to the temp file.
     """
-    # Import module to access and patch FILE_LOCATION
-    import class_exercises.pygame_mvc.game_controller as gc
-
-    floor_plan = make_simple_map(tmp_path)
-    monkeypatch.setattr(gc, "FILE_LOCATION", floor_plan, raising=True)
-
     g = Game()
     return g
 
@@ -116,6 +89,31 @@ class TestCellQueries:
         assert players and isinstance(players[0], Character)
 
 
+class TestSpatialIndex:
+
+    def test_index_follows_character_moves(self, game):
+        game.set_up()
+        player = game.characters[0]
+        start = player.pos
+        game.move_character(player, "e")
+
+        assert player not in game.get_cell_contents(start)
+        assert player in game.get_cell_contents(player.pos)
+
+    def test_index_follows_direct_pos_assignment(self, game):
+        game.set_up()
+        player = game.characters[0]
+        player.pos = Position(2, 2)
+
+        assert game.get_cell_contents(Position(2, 2)) == [player]
+        assert [obj.name for obj in game.get_cell_contents(game.start)] == ["Start"]
+
+    def test_get_cell_contents_returns_copy(self, game):
+        game.set_up()
+        game.get_cell_contents(Position(0, 0)).clear()
+        assert game.check_collision(Position(0, 0)) is True
+
+
 class TestCollisionAndMovement:
 
     def test_outside_bounds_is_collision(self, game):
@@ -204,3 +202,74 @@ class TestGridRendering:
         assert any(ch in grid_text for ch in ("S", "P")), "Expected to see Start or Player initial"
         assert "E" in grid_text or any(o.name == "Exit" for o in game.backgrounds)
 
+
+
+class TestBatchedMovement:
+
+    @pytest.fixture
+    def open_game(self, tmp_path):
+        fp = write_floor_plan(tmp_path, ["S,.,.,.",
+                                         ".,.,W,.",
+                                         ".,.,.,E"])
+        g = Game()
+        g.set_background_from_file(fp)
+        return g
+
+    def add(self, game, *positions):
+        chars = [Character(f"C{i}", Position(*pos)) for i, pos in enumerate(positions)]
+        for c in chars:
+            game.add_character(c)
+        return chars
+
+    def test_walls_and_edges_block(self, open_game):
+        chars = self.add(open_game, (0, 0), (1, 1), (2, 0))
+        moved = open_game.move_characters(chars, ["n", "e", "e"])
+        assert moved.tolist() == [False, False, True]
+        assert [c.pos for c in chars] == [Position(0, 0), Position(1, 1), Position(2, 1)]
+
+    def test_first_character_wins_shared_target(self, open_game):
+        chars = self.add(open_game, (0, 0), (0, 2))
+        assert open_game.move_characters(chars, ["e", "w"]).tolist() == [True, False]
+        assert open_game.get_cell_contents(Position(0, 1)) == [chars[0]]
+
+    def test_train_of_characters_moves_together(self, open_game):
+        chars = self.add(open_game, (0, 0), (0, 1), (0, 2))
+        assert open_game.move_characters(chars, ["e", "e", "e"]).all()
+        assert [c.pos.col for c in chars] == [1, 2, 3]
+
+    def test_blocked_character_blocks_the_one_behind(self, open_game):
+        chars = self.add(open_game, (0, 2), (0, 3))
+        other = self.add(open_game, (1, 3))[0]
+        assert open_game.move_characters(chars, ["e", "s"]).tolist() == [False, False]
+        assert other.pos == Position(1, 3)
+
+    def test_swaps_are_blocked(self, open_game):
+        chars = self.add(open_game, (0, 0), (0, 1))
+        assert not open_game.move_characters(chars, ["e", "w"]).any()
+
+    def test_reloading_map_invalidates_solid_mask(self, tmp_path):
+        g = Game()
+        g.set_tile_map_from_file(write_floor_plan(tmp_path, ["S,.,.",
+                                                             ".,.,."]))
+        char = self.add(g, (0, 0))[0]
+        assert g.move_characters([char], ["s"]).tolist() == [True]
+        g.set_tile_map_from_file(write_floor_plan(tmp_path, ["S,W,.",
+                                                             ".,W,."]))
+        assert g.move_characters([char], ["n"]).tolist() == [True]
+        assert g.move_characters([char], ["e"]).tolist() == [False]
+        assert char.pos == Position(0, 0)
+
+    def test_invalid_direction(self, open_game):
+        chars = self.add(open_game, (0, 0))
+        with pytest.raises(ValueError, match="direction x is not valid"):
+            open_game.move_characters(chars, ["x"])
+
+
+class TestRegionBackgrounds:
+
+    def test_region_backgrounds(self, game):
+        game.set_up()
+        region = game.get_region_backgrounds(range(1, 3), range(0, 2))
+        assert sorted((obj.name, obj.pos) for obj in region) == [("Start", Position(1, 0)),
+                                                                 ("Wall", Position(2, 0)),
+                                                                 ("Wall", Position(2, 1))]
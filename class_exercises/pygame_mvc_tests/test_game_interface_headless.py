@@ -0,0 +1,30 @@
+import pytest
+
+from class_exercises.pygame_MVC.game_interface_headless import HeadlessInterface
+from class_exercises.pygame_MVC.game_objects import Position
+
+
+pytestmark = pytest.mark.usefixtures("patch_floor_plan")
+
+
+class TestHeadlessInterface:
+
+    def test_same_seed_gives_same_run(self):
+        first = HeadlessInterface(seed=42, num_characters=3).main_loop(max_ticks=200, stop_at_exit=False)
+        second = HeadlessInterface(seed=42, num_characters=3).main_loop(max_ticks=200, stop_at_exit=False)
+        assert first.ticks == 200
+        assert first.moves == second.moves
+        assert all(len(tick) == 3 for tick in first.moves)
+
+    def test_replay_script(self):
+        headless = HeadlessInterface(script=["e", "n", "e"])
+        result = headless.main_loop()
+        assert result.ticks == 3
+        assert result.reached_exit is False
+        assert headless.player.pos == Position(0, 2)
+
+    def test_stops_at_exit(self):
+        result = HeadlessInterface(script=["e", "e", "w", "w"]).main_loop()
+        assert result.reached_exit is True
+        assert result.ticks == 2
+        assert result.ticks_per_second > 0
@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+from class_exercises.pygame_MVC.game_interface_tui import IncrementalTextInterface
+
+
+@pytest.fixture
+def tui(patch_floor_plan):
+    return IncrementalTextInterface(out=io.StringIO())
+
+
+class TestIncrementalTextInterface:
+
+    def test_first_draw_is_full_frame(self, tui):
+        tui._draw_area()
+        output = tui.out.getvalue()
+        assert output.startswith('\x1b[2J\x1b[H')
+        assert '║▓..║' in output
+        assert '║P.E║' in output
+        assert tui.game_area[1] == ['P', '.', 'E']
+
+    def test_move_only_rewrites_changed_cells(self, tui):
+        tui._draw_area()
+        tui.out = io.StringIO()
+        tui.game.move_character(tui.player, 'e')
+        tui._draw_area()
+        output = tui.out.getvalue()
+        # Start tile uncovered at (1, 0) and player drawn at (1, 1)
+        assert '\x1b[3;2HS' in output
+        assert '\x1b[3;3HP' in output
+        assert '\x1b[2J' not in output
+        assert tui.game_area[1] == ['S', 'P', 'E']
+
+    def test_blocked_move_writes_no_cells(self, tui):
+        tui._draw_area()
+        tui.out = io.StringIO()
+        tui.game.move_character(tui.player, 'n')
+        tui._draw_area()
+        assert tui.out.getvalue() == '\x1b[6;1H\x1b[K'
@@ -1,5 +1,5 @@
 import pytest
-from class_exercises.pygame_mvc.game_objects import GameObj, Character, Position
+from class_exercises.pygame_MVC.game_objects import GameObj, Character, Position
 
 class TestGameObj:
 
@@ -22,6 +22,14 @@ class TestGameObj:
 
         assert obj.pos == Position(5, 6)
 
+    def test_pos_setter_notifies_observers(self):
+        obj = GameObj("item", Position(0, 0))
+        moves = []
+        obj.add_observer(lambda o, old, new: moves.append((o, old, new)))
+        obj.pos = Position(1, 2)
+
+        assert moves == [(obj, Position(0, 0), Position(1, 2))]
+
 
 class TestCharacter:
 
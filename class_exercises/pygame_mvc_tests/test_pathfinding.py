@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+from class_exercises.pygame_MVC.game_objects import Position, Character
+from class_exercises.pygame_MVC.game_controller import Game
+from class_exercises.pygame_MVC.pathfinding import Pathfinder, UNREACHABLE
+
+
+def make_game(tmp_path, lines, dense=False):
+    fp = tmp_path / "floor_plan.csv"
+    fp.write_text("\n".join(lines), encoding="utf-8")
+    g = Game()
+    if dense:
+        g.set_tile_map_from_file(str(fp))
+    else:
+        g.set_background_from_file(str(fp))
+    return g
+
+
+@pytest.fixture
+def game(tmp_path):
+    # S at (0,0), E at (0,4); the wall in column 2 forces the route down to row 2
+    return make_game(tmp_path, ["S,.,W,.,E",
+                                ".,.,W,.,.",
+                                ".,.,.,.,."])
+
+
+def path_is_valid(game, path, start, goal):
+    mask = game.solid_mask()
+    steps = zip(path, path[1:])
+    return (path[0] == start and path[-1] == goal
+            and not any(mask[pos] for pos in path)
+            and all(abs(a.row - b.row) + abs(a.col - b.col) == 1 for a, b in steps))
+
+
+class TestSearches:
+
+    @pytest.mark.parametrize("method", ["bfs", "a_star", "jps"])
+    def test_shortest_path(self, game, method):
+        path = getattr(Pathfinder(game), method)(game.start, game.exit)
+        assert path_is_valid(game, path, game.start, game.exit)
+        assert len(path) == 9
+
+    @pytest.mark.parametrize("method", ["bfs", "a_star", "jps"])
+    def test_no_route(self, tmp_path, method):
+        g = make_game(tmp_path, ["S,W,E"])
+        assert getattr(Pathfinder(g), method)(g.start, g.exit) is None
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_jps_and_a_star_match_bfs_on_random_maps(self, tmp_path, seed):
+        rng = random.Random(seed)
+        lines = [",".join("W" if rng.random() < 0.3 else "." for _ in range(15)) for _ in range(12)]
+        g = make_game(tmp_path, lines, dense=True)
+        pathfinder = Pathfinder(g)
+        start, goal = Position(0, 0), Position(11, 14)
+        g.tile_map.set_tile(start, None)
+        g.tile_map.set_tile(goal, None)
+
+        expected = pathfinder.bfs(start, goal)
+        for path in (pathfinder.a_star(start, goal), pathfinder.jps(start, goal)):
+            if expected is None:
+                assert path is None
+            else:
+                assert path_is_valid(g, path, start, goal)
+                assert len(path) == len(expected)
+
+
+class TestDistanceField:
+
+    def test_distances_to_exit(self, game):
+        field = Pathfinder(game).distance_field()
+        assert field[0, 4] == 0
+        assert field[0, 0] == 8
+        assert field[0, 2] == UNREACHABLE
+
+    def test_field_is_cached_until_walls_change(self, game):
+        pathfinder = Pathfinder(game)
+        field = pathfinder.distance_field()
+        player = Character("Player", game.start)
+        game.add_character(player)
+        game.move_character(player, "s")
+        assert pathfinder.distance_field() is field
+
+        game.add_background_object("W", Position(2, 2))
+        new_field = pathfinder.distance_field()
+        assert new_field is not field
+        assert new_field[0, 0] == UNREACHABLE
+
+    def test_tile_map_changes_invalidate_field(self, tmp_path):
+        g = make_game(tmp_path, ["S,W,E",
+                                 ".,.,."], dense=True)
+        pathfinder = Pathfinder(g)
+        assert pathfinder.distance_field()[0, 0] == 4
+        g.tile_map.set_tile(Position(0, 1), None)
+        assert pathfinder.distance_field()[0, 0] == 2
+
+    @pytest.mark.parametrize("changes_before_reload", [0, 1])
+    def test_reloading_map_invalidates_cache(self, tmp_path, changes_before_reload):
+        g = make_game(tmp_path, ["S,.,E",
+                                 ".,.,.",
+                                 ".,.,."], dense=True)
+        pathfinder = Pathfinder(g)
+        for _ in range(changes_before_reload):
+            g.tile_map.set_tile(Position(2, 2), "W")
+        assert pathfinder.bfs(Position(0, 0), Position(0, 2)) == [Position(0, 0), Position(0, 1), Position(0, 2)]
+
+        walled = tmp_path / "walled.csv"
+        walled.write_text("\n".join(["S,W,E",
+                                      ".,W,.",
+                                      ".,W,."]), encoding="utf-8")
+        g.set_tile_map_from_file(str(walled))
+        assert pathfinder.bfs(Position(0, 0), Position(0, 2)) is None
+        assert pathfinder.distance_field()[0, 0] == UNREACHABLE
+
+    def test_next_move_walks_to_exit(self, game):
+        pathfinder = Pathfinder(game)
+        player = Character("Player", game.start)
+        game.add_character(player)
+        moves = 0
+        while (direction := pathfinder.next_move(player)) is not None:
+            assert game.move_character(player, direction)
+            moves += 1
+        assert game.at_exit(player)
+        assert moves == 8
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from class_exercises.pygame_MVC.game_objects import GameObj, Position, Character
+from class_exercises.pygame_MVC.game_controller import Game, BACKGROUND_TYPES
+from class_exercises.pygame_MVC.tile_map import TileMap, convert_floor_plan
+
+
+@pytest.fixture
+def game(patch_floor_plan):
+    g = Game()
+    g.set_up(dense=True)
+    return g
+
+
+class TestTileMap:
+
+    def test_arrays_are_compact(self, floor_plan):
+        tile_map = TileMap.from_file(floor_plan, BACKGROUND_TYPES)
+        assert tile_map.types.dtype == np.uint8
+        assert tile_map.dimensions == (3, 3)
+        assert tile_map.solid.tolist() == [[True, False, False],
+                                           [False, False, False],
+                                           [True, True, False]]
+
+    def test_get_creates_and_caches_gameobj(self, floor_plan):
+        tile_map = TileMap.from_file(floor_plan, BACKGROUND_TYPES)
+        wall = tile_map.get(Position(0, 0))
+        assert isinstance(wall, GameObj)
+        assert wall.name == "Wall" and wall.is_solid
+        assert tile_map.get(Position(0, 0)) is wall
+        assert tile_map.get(Position(1, 1)) is None
+
+    def test_find_positions(self, floor_plan):
+        tile_map = TileMap.from_file(floor_plan, BACKGROUND_TYPES)
+        assert tile_map.find_positions("Wall") == [Position(0, 0), Position(2, 0), Position(2, 1)]
+        assert tile_map.find_positions("Lava") == []
+
+    def test_ragged_rows_are_rejected(self, tmp_path):
+        fp = tmp_path / "ragged.csv"
+        fp.write_text("W,.,.\nS,.\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="Row 1 .* has 2 cells, expected 3"):
+            TileMap.from_file(str(fp), BACKGROUND_TYPES)
+
+
+class TestDenseGame:
+
+    def test_set_up(self, game):
+        assert game.backgrounds == []
+        assert game.dimensions == (3, 3)
+        assert game.start == Position(1, 0)
+        assert game.exit == Position(1, 2)
+        assert game.characters[0].pos == game.start
+
+    def test_collision_uses_solid_mask(self, game):
+        assert game.check_collision(Position(0, 0)) is True
+        assert game.check_collision(Position(1, 1)) is False
+        assert game.check_collision(Position(3, 0)) is True
+
+    def test_cell_contents_include_lazy_background(self, game):
+        names = [obj.name for obj in game.get_cell_contents(game.start)]
+        assert names == ["Start", "Player"]
+        assert isinstance(game.get_cell_contents(game.start)[1], Character)
+
+    def test_move_character(self, game):
+        player = game.characters[0]
+        assert game.move_character(player, "n") is False
+        assert game.move_character(player, "e") is True
+        assert player.pos == Position(1, 1)
+
+
+class TestBinaryMap:
+
+    @pytest.fixture
+    def binary_map(self, floor_plan, tmp_path):
+        binary_location = str(tmp_path / "floor_plan.tmap")
+        convert_floor_plan(floor_plan, binary_location, BACKGROUND_TYPES)
+        return binary_location
+
+    def test_round_trip(self, floor_plan, binary_map):
+        from_csv = TileMap.from_file(floor_plan, BACKGROUND_TYPES)
+        from_binary = TileMap.from_binary(binary_map, BACKGROUND_TYPES)
+        assert from_binary.dimensions == (3, 3)
+        assert np.array_equal(from_binary.types, from_csv.types)
+        assert from_binary.first_position("Start") == Position(1, 0)
+        assert from_binary.first_position("Exit") == Position(1, 2)
+
+    def test_game_from_binary(self, binary_map):
+        g = Game()
+        g.set_tile_map_from_binary(binary_map)
+        assert g.start == Position(1, 0)
+        assert g.check_collision(Position(2, 1)) is True
+        assert g.check_collision(Position(2, 2)) is False
+
+    def test_set_tile_on_binary_map(self, binary_map):
+        tile_map = TileMap.from_binary(binary_map, BACKGROUND_TYPES)
+        tile_map.set_tile(Position(1, 1), "W")
+        assert tile_map.is_solid(Position(1, 1))
+        assert tile_map.version == 1
+        # The change is only made in memory, not in the file
+        assert not TileMap.from_binary(binary_map, BACKGROUND_TYPES).is_solid(Position(1, 1))
+
+    def test_rejects_other_files(self, floor_plan):
+        with pytest.raises(ValueError, match="binary map file"):
+            TileMap.from_binary(floor_plan, BACKGROUND_TYPES)
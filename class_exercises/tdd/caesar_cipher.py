@@ -1,18 +1,63 @@
+from functools import lru_cache
+from string import ascii_lowercase, ascii_uppercase
+
+import numpy as np
+
+DEFAULT_ALPHABETS = (ascii_lowercase, ascii_uppercase)
+
+
+def _shifted(alphabet: str, shift: int) -> str:
+    shift %= len(alphabet)
+    return alphabet[shift:] + alphabet[:shift]
+
+
+@lru_cache(maxsize=None)
+def translation_table(shift: int, alphabets: tuple[str, ...] = DEFAULT_ALPHABETS) -> dict[int, int]:
+    """ A str.translate table shifting every letter of each alphabet by shift places, wrapping round at the end.
+    Characters not in any alphabet are left alone. Tables are cached, so each shift is only built once """
+    return str.maketrans(''.join(alphabets), ''.join(_shifted(alphabet, shift) for alphabet in alphabets))
+
+
+@lru_cache(maxsize=None)
+def byte_table(shift: int, alphabets: tuple[str, ...] = DEFAULT_ALPHABETS) -> bytes:
+    """ The 256-byte table for bytes.translate, for alphabets made only of ASCII characters """
+    letters = ''.join(alphabets)
+    if not letters.isascii():
+        raise ValueError('bytes can only be encoded with ASCII alphabets')
+    shifted = ''.join(_shifted(alphabet, shift) for alphabet in alphabets)
+    return bytes.maketrans(letters.encode('ascii'), shifted.encode('ascii'))
+
+
+class CaesarCipher:
+    """ Caesar cipher over one or more alphabets (lower and upper case by default), shifting each letter within
+    its own alphabet. Text is encoded with str.translate and bytes with bytes.translate, so the work is done
+    in C in one pass rather than a character at a time."""
+    def __init__(self, alphabets: tuple[str, ...] = DEFAULT_ALPHABETS):
+        self.alphabets = tuple(alphabets)
+
+    def encode(self, text: str, shift: int) -> str:
+        return text.translate(translation_table(shift, self.alphabets))
+
+    def decode(self, text: str, shift: int) -> str:
+        return self.encode(text, -shift)
+
+    def encode_bytes(self, data: bytes, shift: int) -> bytes:
+        return data.translate(byte_table(shift, self.alphabets))
+
+    def decode_bytes(self, data: bytes, shift: int) -> bytes:
+        return self.encode_bytes(data, -shift)
+
+    def encode_array(self, data: np.ndarray, shift: int) -> np.ndarray:
+        """ Encode a uint8 array of ASCII codes (e.g. from np.frombuffer or np.memmap) with a lookup table """
+        lookup = np.frombuffer(byte_table(shift, self.alphabets), dtype=np.uint8)
+        return lookup[data]
+
+
 def encode_message(plain_text_message, p_shift):
     """ Encode a message using the Caesar Cipher"""
-    plain_text_message = plain_text_message.lower()
-    encoded_message = ""
-
-    for letter in plain_text_message:
-
-        if letter.isalpha():
-            num = ord(letter)
-            num += p_shift
-            if num > ord("z"):
-                num -= 26
-            char = chr(num)
-            encoded_message += char
-        else:
-            encoded_message += letter
-
-    return encoded_message
\ No newline at end of file
+    return CaesarCipher((ascii_lowercase,)).encode(plain_text_message.lower(), p_shift)
+
+
+def decode_message(encoded_message, p_shift):
+    """ Decode a message encoded with encode_message"""
+    return CaesarCipher((ascii_lowercase,)).decode(encoded_message, p_shift)
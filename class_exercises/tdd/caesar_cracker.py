@@ -0,0 +1,48 @@
+import numpy as np
+
+from class_exercises.tdd.caesar_cipher import CaesarCipher
+
+# Relative frequency of each letter a-z in English text, normalised to sum to exactly 1
+_PERCENTAGES = np.array([8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025,
+                         2.406, 6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150,
+                         1.974, 0.074])
+ENGLISH_FREQUENCIES = _PERCENTAGES / _PERCENTAGES.sum()
+
+# SHIFT_MATRIX[c, s] is 1 / the English frequency of the plain letter which encodes to letter c with shift s
+_letters = np.arange(26)
+SHIFT_MATRIX = 1 / ENGLISH_FREQUENCIES[(_letters[:, None] - _letters[None, :]) % 26]
+
+
+def letter_counts(messages: list[str]) -> np.ndarray:
+    """ Count the letters a-z in every message in one np.bincount, giving an array of shape (len(messages), 26).
+    Upper case letters are counted with lower case, anything else is ignored """
+    encoded = [message.lower().encode('ascii', errors='ignore') for message in messages]
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.int64) - ord('a')
+    message_ids = np.repeat(np.arange(len(messages)), [len(e) for e in encoded])
+    is_letter = (data >= 0) & (data < 26)
+    counts = np.bincount(message_ids[is_letter] * 26 + data[is_letter], minlength=len(messages) * 26)
+    return counts.reshape(len(messages), 26)
+
+
+def chi_squared_scores(counts: np.ndarray) -> np.ndarray:
+    """ Chi-squared statistic for every message (row of counts) and every shift, comparing the letters each shift
+    would decode to against English. Expanding sum((O - E)^2 / E) with E = N * f leaves sum(O^2 / f) / N - N,
+    and the sum(O^2 / f) for all 26 shifts is one matrix product with SHIFT_MATRIX """
+    counts = np.atleast_2d(counts).astype(float)
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = (counts ** 2) @ SHIFT_MATRIX / totals - totals
+    # Messages without any letters can't be scored
+    return np.where(totals > 0, scores, np.inf)
+
+
+def find_shifts(messages: list[str]) -> np.ndarray:
+    """ The most likely shift for each message - the one with the lowest chi-squared score """
+    return chi_squared_scores(letter_counts(messages)).argmin(axis=1)
+
+
+def crack_message(encoded_message: str, cipher: CaesarCipher | None = None) -> tuple[int, str]:
+    """ Returns the most likely shift and the decoded message """
+    cipher = cipher or CaesarCipher()
+    shift = int(find_shifts([encoded_message])[0])
+    return shift, cipher.decode(encoded_message, shift)
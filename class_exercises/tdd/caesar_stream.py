@@ -0,0 +1,76 @@
+import argparse
+import mmap
+import os
+import stat
+import sys
+import time
+from collections import namedtuple
+from typing import BinaryIO
+
+from class_exercises.tdd.caesar_cipher import CaesarCipher
+
+StreamStats = namedtuple('StreamStats', ('bytes', 'seconds', 'mb_per_second'))
+
+CHUNK_SIZE = 1 << 20
+
+
+def encode_stream(source: BinaryIO, destination: BinaryIO, shift: int, cipher: CaesarCipher | None = None,
+                  chunk_size: int = CHUNK_SIZE) -> int:
+    """ Read source a chunk at a time, encode each chunk and write it out, so memory use doesn't depend on the
+    size of the input. Works on bytes: ASCII letters never appear inside a multibyte UTF-8 character, so UTF-8
+    text is encoded correctly. Returns the number of bytes written."""
+    cipher = cipher or CaesarCipher()
+    total = 0
+    while chunk := source.read(chunk_size):
+        destination.write(cipher.encode_bytes(chunk, shift))
+        total += len(chunk)
+    return total
+
+
+def encode_mapped(source: BinaryIO, destination: BinaryIO, shift: int, cipher: CaesarCipher | None = None,
+                  chunk_size: int = CHUNK_SIZE) -> int:
+    """ As encode_stream, but memory-maps the source file and lets the operating system page it in. Empty files
+    and sources which can't be mapped (pipes, terminals) are streamed instead """
+    cipher = cipher or CaesarCipher()
+    file_stat = os.fstat(source.fileno())
+    if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size == 0:
+        return encode_stream(source, destination, shift, cipher, chunk_size)
+    with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for start in range(0, len(mapped), chunk_size):
+            destination.write(cipher.encode_bytes(mapped[start:start + chunk_size], shift))
+        return len(mapped)
+
+
+def encode_file(input_location: str, output_location: str, shift: int, decode: bool = False,
+                use_mmap: bool = False, chunk_size: int = CHUNK_SIZE) -> StreamStats:
+    """ Encode (or decode) one file into another. '-' means stdin or stdout """
+    if decode:
+        shift = -shift
+    encode = encode_mapped if use_mmap else encode_stream
+    start = time.perf_counter()
+    with _open(input_location, 'rb', sys.stdin) as source, _open(output_location, 'wb', sys.stdout) as destination:
+        total = encode(source, destination, shift, chunk_size=chunk_size)
+    seconds = time.perf_counter() - start
+    mb_per_second = total / 1_000_000 / seconds if seconds > 0 else float('inf')
+    return StreamStats(total, seconds, mb_per_second)
+
+
+def _open(location: str, mode: str, standard_stream):
+    if location == '-':
+        # Use the binary buffer underneath stdin/stdout, and don't close it when finished
+        return open(standard_stream.buffer.fileno(), mode, closefd=False)
+    return open(location, mode)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Encode a file with the Caesar cipher, a chunk at a time')
+    parser.add_argument('input', help="file to encode, or - for stdin")
+    parser.add_argument('output', help="file to write, or - for stdout")
+    parser.add_argument('-s', '--shift', type=int, default=3)
+    parser.add_argument('-d', '--decode', action='store_true', help='decode rather than encode')
+    parser.add_argument('--mmap', action='store_true', help='memory-map the input file')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='bytes to read at a time')
+    args = parser.parse_args()
+
+    stats = encode_file(args.input, args.output, args.shift, args.decode, args.mmap, args.chunk_size)
+    print(f'{stats.bytes:,} bytes in {stats.seconds:.3f}s ({stats.mb_per_second:.1f} MB/s)', file=sys.stderr)
@@ -1,3 +1,31 @@
+import json
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+MAX_SCORE = 350
+
+# Minimum raw score for each grade, highest grade first. Scores below every boundary get LOWEST_GRADE
+GRADE_BOUNDARIES = {"A*": 264,
+                    "A": 229,
+                    "B": 189,
+                    "C": 150,
+                    "D": 111,
+                    "E": 72,
+                    }
+LOWEST_GRADE = "U"
+
+BOUNDARIES_FILE = Path(__file__).resolve().parent / "grade_boundaries.json"
+
+GradeSummary = namedtuple('GradeSummary', ('grades', 'distribution'))
+# The fields match the keyword arguments of calc_grades, so a set can be used as calc_grades(scores, **set._asdict())
+BoundarySet = namedtuple('BoundarySet', ('boundaries', 'max_score'))
+# lookup[score] is the index in labels of the grade for that score
+GradeTable = namedtuple('GradeTable', ('labels', 'lookup'))
+
+
 def calc_grade(raw_score: int) -> str:
 
     # Check raw_score is an integer
@@ -35,6 +63,56 @@ def calc_grade(raw_score: int) -> str:
     return grade
 
 
+def calc_grades(raw_scores, boundaries: dict[str, int] = GRADE_BOUNDARIES,
+                max_score: int = MAX_SCORE) -> GradeSummary:
+    """ Grade a whole cohort at once. raw_scores can be a list or NumPy array of integers; the grades are read
+    from the compiled grade_table for the boundaries rather than checking each boundary in turn.
+    Returns the array of grades and a dictionary of how many students got each grade, highest grade first."""
+    scores = np.asarray(raw_scores)
+    if scores.size == 0:
+        # np.asarray([]) is a float array, which can't be used to index the lookup table
+        scores = scores.astype(np.int64)
+    elif not np.issubdtype(scores.dtype, np.integer):
+        raise TypeError("Raw scores must be integers")
+    if (scores > max_score).any():
+        raise ValueError(f"Raw scores must be less than or equal to {max_score}")
+    if (scores < 0).any():
+        raise ValueError("Raw scores must be greater than or equal to 0")
+
+    labels, lookup = grade_table(boundaries, max_score)
+    grade_index = lookup[scores]
+
+    counts = np.bincount(grade_index.ravel(), minlength=len(labels))
+    distribution = {str(label): int(count) for label, count in zip(labels[::-1], counts[::-1])}
+    return GradeSummary(labels[grade_index], distribution)
+
+
+def grade_table(boundaries: dict[str, int], max_score: int = MAX_SCORE) -> GradeTable:
+    """ The compiled GradeTable for a set of boundaries. Compiled tables are cached, so each set of boundaries
+    is only compiled once however many times it is used """
+    return _compile_grade_table(tuple(boundaries.items()), max_score)
+
+
+@lru_cache(maxsize=None)
+def _compile_grade_table(boundaries: tuple[tuple[str, int], ...], max_score: int) -> GradeTable:
+    """ Work out the grade of every possible score from 0 to max_score, so grading a score is a single index.
+    A binary search (np.searchsorted) over the ascending boundaries gives each score's grade """
+    ordered = sorted(boundaries, key=lambda item: item[1])
+    thresholds = np.array([score for _, score in ordered])
+    labels = np.array([LOWEST_GRADE] + [grade for grade, _ in ordered])
+    lookup = np.searchsorted(thresholds, np.arange(max_score + 1), side='right').astype(np.uint8)
+    lookup.flags.writeable = False
+    return GradeTable(labels, lookup)
+
+
+def load_boundary_sets(file_location: str | Path = BOUNDARIES_FILE) -> dict[str, BoundarySet]:
+    """ Read named boundary sets (e.g. one per subject and year) from a JSON file of the form
+    {"name": {"max_score": 350, "boundaries": {"A*": 264, ...}}, ...} """
+    with open(file_location, 'r') as f:
+        data = json.load(f)
+    return {name: BoundarySet(boundaries=dict(entry['boundaries']), max_score=int(entry['max_score']))
+            for name, entry in data.items()}
+
 
 if __name__ == "__main__":
     print(calc_grade(234))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from string import digits
+from class_exercises.tdd.caesar_cipher import CaesarCipher, encode_message, decode_message
+
+
+def test_encode_message():
+    assert encode_message("Hello, World!", 3) == "khoor, zruog!"
+    assert encode_message("xyz", 3) == "abc"
+
+
+def test_decode_message():
+    assert decode_message("khoor", 3) == "hello"
+
+
+@pytest.mark.parametrize("shift", [0, 1, 13, 25, 26, 27, -1, -30])
+def test_round_trip(shift):
+    cipher = CaesarCipher()
+    text = "The Quick Brown Fox, 123!"
+    assert cipher.decode(cipher.encode(text, shift), shift) == text
+
+
+def test_upper_case_keeps_case():
+    assert CaesarCipher().encode("Zebra", 1) == "Afcsb"
+
+
+def test_custom_alphabet():
+    assert CaesarCipher((digits,)).encode("09 a", 1) == "10 a"
+
+
+def test_bytes_and_array_match_text():
+    cipher = CaesarCipher()
+    text = "Attack at dawn!"
+    expected = cipher.encode(text, 5).encode("ascii")
+    assert cipher.encode_bytes(text.encode("ascii"), 5) == expected
+    array = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    assert cipher.encode_array(array, 5).tobytes() == expected
+
+
+def test_bytes_need_ascii_alphabet():
+    with pytest.raises(ValueError):
+        CaesarCipher(("αβγ",)).encode_bytes(b"abc", 1)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from class_exercises.tdd.caesar_cipher import CaesarCipher
+from class_exercises.tdd.caesar_cracker import letter_counts, chi_squared_scores, find_shifts, crack_message
+
+PLAIN = ("It was the best of times, it was the worst of times, it was the age of wisdom, "
+         "it was the age of foolishness, it was the epoch of belief, it was the epoch of incredulity")
+
+
+def test_letter_counts():
+    counts = letter_counts(["Aab!", "", "zz"])
+    assert counts.shape == (3, 26)
+    assert counts[0, 0] == 2 and counts[0, 1] == 1
+    assert counts[1].sum() == 0
+    assert counts[2, 25] == 2
+
+
+def test_chi_squared_matches_direct_calculation():
+    from class_exercises.tdd.caesar_cracker import ENGLISH_FREQUENCIES
+    counts = letter_counts([CaesarCipher().encode(PLAIN, 7)])[0]
+    expected = [((np.roll(counts, -shift) - counts.sum() * ENGLISH_FREQUENCIES) ** 2
+                 / (counts.sum() * ENGLISH_FREQUENCIES)).sum() for shift in range(26)]
+    assert chi_squared_scores(counts)[0] == pytest.approx(expected)
+
+
+def test_find_shifts_batch():
+    cipher = CaesarCipher()
+    shifts = [0, 3, 13, 25]
+    messages = [cipher.encode(PLAIN, shift) for shift in shifts] + ["1234"]
+    found = find_shifts(messages)
+    assert found[:4].tolist() == shifts
+
+
+def test_crack_message():
+    assert crack_message(CaesarCipher().encode(PLAIN, 11)) == (11, PLAIN)
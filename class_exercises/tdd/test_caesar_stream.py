@@ -0,0 +1,48 @@
+import io
+import os
+
+import pytest
+from class_exercises.tdd.caesar_cipher import CaesarCipher
+from class_exercises.tdd.caesar_stream import encode_stream, encode_mapped, encode_file
+
+TEXT = "Caesar's café log line 1\nZebra crossing ZZZ\n" * 50
+
+
+def test_encode_stream_small_chunks():
+    destination = io.BytesIO()
+    written = encode_stream(io.BytesIO(TEXT.encode("utf-8")), destination, 3, chunk_size=7)
+    assert written == len(TEXT.encode("utf-8"))
+    assert destination.getvalue().decode("utf-8") == CaesarCipher().encode(TEXT, 3)
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_encode_file_round_trip(tmp_path, use_mmap):
+    plain, encoded, decoded = tmp_path / "plain.log", tmp_path / "encoded.log", tmp_path / "decoded.log"
+    plain.write_text(TEXT, encoding="utf-8")
+    stats = encode_file(str(plain), str(encoded), 5, use_mmap=use_mmap, chunk_size=64)
+    encode_file(str(encoded), str(decoded), 5, decode=True, use_mmap=use_mmap)
+
+    assert stats.bytes == plain.stat().st_size
+    assert stats.mb_per_second > 0
+    assert encoded.read_text(encoding="utf-8") == CaesarCipher().encode(TEXT, 5)
+    assert decoded.read_text(encoding="utf-8") == TEXT
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_encode_empty_file(tmp_path, use_mmap):
+    plain, encoded = tmp_path / "empty.log", tmp_path / "encoded.log"
+    plain.write_bytes(b"")
+    stats = encode_file(str(plain), str(encoded), 5, use_mmap=use_mmap)
+    assert stats.bytes == 0
+    assert encoded.read_bytes() == b""
+
+
+def test_encode_mapped_falls_back_for_pipes():
+    read_fd, write_fd = os.pipe()
+    with open(write_fd, "wb") as pipe_in:
+        pipe_in.write(TEXT.encode("utf-8"))
+    destination = io.BytesIO()
+    with open(read_fd, "rb") as pipe_out:
+        written = encode_mapped(pipe_out, destination, 3)
+    assert written == len(TEXT.encode("utf-8"))
+    assert destination.getvalue().decode("utf-8") == CaesarCipher().encode(TEXT, 3)
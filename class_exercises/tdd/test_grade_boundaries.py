@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
-from class_exercises.tdd.exercises_for_testing import calc_grade
-from class_exercises.tdd.exercises_for_testing import encode_message
+from class_exercises.tdd.exercises_for_testing import (calc_grade, calc_grades, grade_table, load_boundary_sets,
+                                                    GRADE_BOUNDARIES)
+from class_exercises.tdd.caesar_cipher import encode_message
 
 test_data = [(0, "U"),
              (72, "E"),
@@ -32,4 +34,50 @@ def test_calc_grade():
 
 
 def test_encode_message_normal():
-    assert encode_message("hello", 3) == "khoor"
\ No newline at end of file
+    assert encode_message("hello", 3) == "khoor"
+
+
+def test_calc_grades_matches_calc_grade():
+    scores = list(range(0, 351))
+    summary = calc_grades(scores)
+    assert summary.grades.tolist() == [calc_grade(score) for score in scores]
+
+
+def test_calc_grades_distribution():
+    summary = calc_grades(np.array([[0, 72], [264, 350]]))
+    assert summary.grades.tolist() == [["U", "E"], ["A*", "A*"]]
+    assert summary.distribution == {"A*": 2, "A": 0, "B": 0, "C": 0, "D": 0, "E": 1, "U": 1}
+
+
+def test_calc_grades_empty_cohort():
+    summary = calc_grades([])
+    assert summary.grades.tolist() == []
+    assert summary.distribution == {"A*": 0, "A": 0, "B": 0, "C": 0, "D": 0, "E": 0, "U": 0}
+
+
+def test_calc_grades_custom_boundaries():
+    summary = calc_grades([10, 50, 99], boundaries={"Pass": 50, "Merit": 80}, max_score=100)
+    assert summary.grades.tolist() == ["U", "Pass", "Merit"]
+    assert list(summary.distribution) == ["Merit", "Pass", "U"]
+
+
+def test_calc_grades_invalid():
+    with pytest.raises(ValueError):
+        calc_grades([100, 400])
+    with pytest.raises(ValueError):
+        calc_grades(np.array([-1, 5]))
+    with pytest.raises(TypeError):
+        calc_grades([1.5, 2])
+
+
+def test_load_boundary_sets():
+    boundary_sets = load_boundary_sets()
+    assert boundary_sets["A-level 2025"].boundaries == GRADE_BOUNDARIES
+    summary = calc_grades([40, 79, 80], **boundary_sets["BTEC unit"]._asdict())
+    assert summary.grades.tolist() == ["P", "M", "D"]
+
+
+def test_grade_table_is_compiled_once():
+    first = grade_table({"Pass": 50}, max_score=100)
+    assert grade_table({"Pass": 50}, max_score=100) is first
+    assert first.lookup.tolist() == [0] * 50 + [1] * 51